@@ -1,18 +1,53 @@
+import importlib
 import sys
 from pathlib import Path
 
-import tyro
-
-from .render_chart import Exit, render_chart
+from .exit import Exit
 
 USE_TYRO = True
 
+# Each command is only imported when it is run, to keep startup fast
+COMMANDS = {
+    'build': 'build:build',
+    'coverage': 'coverage:coverage',
+    'export': 'tabular:export_fingerings',
+    'import': 'tabular:import_fingerings',
+    'infer': 'infer:infer',
+    'show': 'text_renderer:show',
+    'sprites': 'sprites:sprites',
+    'transitions': 'transitions:transitions',
+    'trills': 'trills:trills',
+}
+
+# Commands that are called directly, without tyro, when given no options
+PLAIN = {'show'}
+
 
 def main():
     try:
-        if USE_TYRO:
-            tyro.cli(render_chart)
+        argv = sys.argv[1:]
+        if argv and (name := COMMANDS.get(argv[0])):
+            command = _command(name)
+            if argv[0] in PLAIN and not any(a.startswith('-') for a in argv[1:]):
+                command(argv[1:])
+            else:
+                import tyro
+
+                tyro.cli(command, prog=f'fing {argv[0]}', args=argv[1:])
         else:
-            render_chart([Path(i) for i in sys.argv[1:]])
+            from .render_chart import render_chart
+
+            if USE_TYRO:
+                import tyro
+
+                tyro.cli(render_chart)
+            else:
+                render_chart([Path(i) for i in argv])
     except Exit as e:
         print('ERROR:', *e.args, file=sys.stderr)
+        sys.exit(1)
+
+
+def _command(name: str):
+    module, _, function = name.partition(':')
+    return getattr(importlib.import_module(f'.{module}', __package__), function)
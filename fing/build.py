@@ -0,0 +1,217 @@
+"""
+Rebuild only the charts whose inputs have changed, like `make`.
+
+Charts come from a manifest like `charts/charts.toml`:
+
+    [charts.'recorder-fingerings.svg']
+    inputs = ['../fingerings/recorder/recorder-fingering.toml', ...]
+    compact = false
+
+or, with no manifest, from naming conventions: in each directory under
+`fingerings/`, `NAME.toml` with `NAME.layout.toml` makes `charts/NAME.svg`,
+and each style file `NAME.STYLE.toml` also makes `charts/NAME.STYLE.svg`.
+
+The content hashes of each chart's inputs and output are kept in a state file
+next to the charts, so a chart is only rebuilt if an input, the chart itself,
+or the `fing` code that renders it has changed.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import hashlib
+import json
+import os
+import sys
+import tomllib
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .exit import Exit
+from .render_chart import load_system, render_svg
+
+MANIFEST = Path('charts/charts.toml')
+FINGERINGS = Path('fingerings')
+STATE_FILE = '.fing-build.json'
+
+
+class Chart(NamedTuple):
+    output: Path
+    inputs: tuple[Path, ...]
+    compact: bool = False
+
+
+@dc.dataclass(frozen=True)
+class Builder:
+    charts: Sequence[Chart]
+    state_file: Path
+
+    @cached_property
+    def state(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.state_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @cached_property
+    def code_hash(self) -> str:
+        files = sorted(Path(__file__).parent.glob('*.py'))
+        return _hash(*(f.read_bytes() for f in files))
+
+    def key(self, path: Path) -> str:
+        """A path relative to the state file, the same from any directory"""
+        return Path(
+            os.path.relpath(path.resolve(), self.state_file.parent.resolve())
+        ).as_posix()
+
+    def record(self, chart: Chart) -> dict[str, Any]:
+        """What the state file should hold for an up-to-date chart"""
+        inputs = {self.key(p): _hash(p.read_bytes()) for p in chart.inputs}
+        return {'code': self.code_hash, 'compact': chart.compact, 'inputs': inputs}
+
+    def is_stale(self, chart: Chart) -> bool:
+        if not (old := self.state.get(self.key(chart.output))):
+            return True
+        if not chart.output.exists():
+            return True
+        if old.get('output') != _hash(chart.output.read_bytes()):
+            return True
+        return {k: v for k, v in old.items() if k != 'output'} != self.record(chart)
+
+    def stale(self, force: bool = False) -> list[Chart]:
+        return [c for c in self.charts if force or self.is_stale(c)]
+
+    def render(self, charts: Sequence[Chart], jobs: int | None = None) -> list[str]:
+        args = [(c.inputs, c.compact) for c in charts]
+        if len(charts) < 2 or jobs == 1:
+            return [_render(*a) for a in args]
+        with ProcessPoolExecutor(jobs) as executor:
+            return list(executor.map(_render, *zip(*args)))
+
+    def build(self, force: bool = False, jobs: int | None = None) -> list[Chart]:
+        """Rebuild the stale charts, and return them"""
+        stale = self.stale(force)
+        for chart, svg in zip(stale, self.render(stale, jobs)):
+            chart.output.parent.mkdir(parents=True, exist_ok=True)
+            chart.output.write_text(svg)
+            self.state[self.key(chart.output)] = self.record(chart) | {
+                'output': _hash(svg.encode())
+            }
+
+        if stale:
+            self.state_file.write_text(
+                json.dumps(self.state, indent=2, sort_keys=True) + '\n'
+            )
+        return stale
+
+    def check(self, jobs: int | None = None) -> list[Chart]:
+        """Return the charts that are out of date, without writing anything"""
+        stale = self.stale()
+        svgs = self.render(stale, jobs)
+        return [
+            c
+            for c, s in zip(stale, svgs)
+            if not c.output.exists() or c.output.read_text() != s
+        ]
+
+
+def read_manifest(manifest: Path) -> list[Chart]:
+    with manifest.open('rb') as fp:
+        data = tomllib.load(fp)
+
+    root = manifest.parent
+    charts = []
+    for name, chart in data.get('charts', {}).items():
+        if not (inputs := chart.get('inputs')):
+            raise Exit(f'{manifest}: No inputs for {name}')
+        paths = tuple(_normalize(root / p) for p in inputs)
+        charts.append(
+            Chart(_normalize(root / name), paths, chart.get('compact', False))
+        )
+    return charts
+
+
+def find_charts(fingerings: Path, output: Path) -> list[Chart]:
+    charts = []
+    for layout in sorted(fingerings.glob('*/*.layout.toml')):
+        name = layout.name.removesuffix('.layout.toml')
+        system = layout.with_name(f'{name}.toml')
+        if not system.exists():
+            continue
+        charts.append(Chart(output / f'{name}.svg', (system, layout)))
+        for style in sorted(layout.parent.glob(f'{name}.*.toml')):
+            if style != layout:
+                stem = style.name.removesuffix('.toml')
+                charts.append(Chart(output / f'{stem}.svg', (system, layout, style)))
+    return charts
+
+
+def build(
+    manifest: Path | None = None,
+    /,
+    check: bool = False,
+    force: bool = False,
+    jobs: int | None = None,
+) -> None:
+    """Rebuild the charts whose inputs have changed.
+
+    The charts come from `manifest`, or `charts/charts.toml` if it exists, or
+    otherwise from the files under `fingerings/`. Both of those are found in
+    the current directory or the nearest parent that has either of them.
+
+    With --check, don't write anything, but fail if any chart is out of date.
+    """
+    root = _root()
+    if manifest is None and (root / MANIFEST).exists():
+        manifest = root / MANIFEST
+    if manifest is None:
+        state = root / MANIFEST.parent
+        charts = find_charts(root / FINGERINGS, state)
+    elif manifest.exists():
+        charts, state = read_manifest(manifest), manifest.parent
+    else:
+        raise Exit(f'{manifest} does not exist')
+
+    if missing := sorted({str(p) for c in charts for p in c.inputs if not p.exists()}):
+        raise Exit(f'Missing inputs: {", ".join(missing)}')
+
+    builder = Builder(charts, state / STATE_FILE)
+    if check:
+        if stale := builder.check(jobs):
+            raise Exit(f'Out of date: {", ".join(str(c.output) for c in stale)}')
+        print(f'{len(charts)} chart(s) up to date', file=sys.stderr)
+    else:
+        built = builder.build(force, jobs)
+        for chart in built:
+            print('Built', chart.output, file=sys.stderr)
+        print(f'{len(built)} of {len(charts)} chart(s) rebuilt', file=sys.stderr)
+
+
+def _root() -> Path:
+    """The nearest directory, from the current one up, with charts or fingerings"""
+    cwd = Path.cwd()
+    for i, d in enumerate((cwd, *cwd.parents)):
+        if (d / MANIFEST).exists() or (d / FINGERINGS).is_dir():
+            return Path(*['..'] * i)
+    return Path()
+
+
+def _render(inputs: Sequence[Path], compact: bool) -> str:
+    fs, layout = load_system(list(inputs))
+    if layout is None:
+        raise Exit(f'No layout in {inputs}')
+    return render_svg(fs, layout, compact) + '\n'
+
+
+def _hash(*parts: bytes) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p)
+    return h.hexdigest()
+
+
+def _normalize(p: Path) -> Path:
+    return Path(os.path.normpath(p))
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import cached_property
+from typing import Any
+
+
+def compute_all(obj: Any, skip: Iterable[str] = ()) -> None:
+    """Compute every cached_property of `obj` that isn't in `skip`.
+
+    After this, reading the object never writes to it, so it can be shared
+    between threads, even on free-threaded builds of Python.
+    """
+    skip = set(skip)
+    for cls in reversed(type(obj).__mro__):
+        for k, v in vars(cls).items():
+            if isinstance(v, cached_property) and k not in skip:
+                getattr(obj, k)
@@ -28,11 +28,17 @@ class ChartPiece:
     y: int
     height: int = 0
 
-    def render(self, fingering: Sequence[Button]) -> list[Element]:
+    def part_name(self, fingering: Sequence[Button]) -> str:
+        """The key of `parts` that this fingering shows"""
         for f in fingering:
-            if parts := self.parts.get(f.name) or self.parts.get(f.short_name):
-                break
-        else:
-            parts = self.parts['_off']
+            for name in (f.name, f.short_name):
+                if name in self.parts:
+                    return name
+        return '_off'
+
+    def render(self, fingering: Sequence[Button]) -> list[Element]:
+        return self.render_part(self.part_name(fingering))
+
+    def render_part(self, name: str) -> list[Element]:
         d = {'x': str(self.x), 'y': str(self.y)}
-        return [Element('use', d | p.asdict()) for p in parts]
+        return [Element('use', d | p.asdict()) for p in self.parts[name]]
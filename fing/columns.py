@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import dataclasses as dc
+from collections.abc import Iterable, Sequence
+
+import tomlkit
+from tomlkit.items import String
+
+from .fingering_system import Button
+
+_NAMES = 'C_ Db D_ Eb E_ F_ Gb G_ Ab A_ Bb B_'.split()
+
+
+@dc.dataclass(frozen=True)
+class Columns:
+    """Lay out fingering strings as aligned columns, like the TOML fingering tables.
+
+    There is either one column per button, as in the sax fingerings, or one
+    column per press, shared between buttons pressed by the same finger, as in
+    the recorder fingerings.
+    """
+
+    columns: dict[str, int]
+    count: int
+    width: int
+    by_press: bool = False
+
+    def format(self, tokens: Sequence[str]) -> str:
+        cells = [''] * self.count
+        for t in tokens:
+            if (i := self.columns.get(t)) is None or cells[i]:
+                return ' '.join(tokens)
+            cells[i] = t
+        return ''.join(c.ljust(self.width) for c in cells)
+
+    @staticmethod
+    def make(
+        buttons: Sequence[Button], by_press: bool = False, width: int = 0
+    ) -> Columns:
+        keys = [b.press if by_press else b.name for b in buttons]
+        index = {k: i for i, k in enumerate(dict.fromkeys(keys))}
+        columns = {}
+        for b, k in zip(buttons, keys):
+            columns[b.name] = columns[b.short_name] = index[k]
+        width = max(width, 1 + max((len(b.short_name) for b in buttons), default=0))
+        return Columns(columns, len(index), width, by_press)
+
+    @staticmethod
+    def detect(buttons: Sequence[Button], strings: Iterable[str]) -> Columns | None:
+        """Return the layout that reproduces the most `strings` exactly, if any"""
+        candidates = [Columns.make(buttons, by_press) for by_press in (True, False)]
+        counts = [0, 0]
+        for s in strings:
+            if s == ' '.join(tokens := s.split()):
+                continue  # Fits any layout, as format() falls back to this
+            for i, c in enumerate(candidates):
+                counts[i] += c.format(tokens) == s
+        if best := max(counts):
+            return candidates[counts.index(best)]
+        return None
+
+
+def note_key(note_number: int) -> str:
+    """The key of a note in a fingerings table, padded like 'C_1' or 'Eb1'"""
+    octave, offset = divmod(note_number, 12)
+    return f'{_NAMES[offset]}{octave}'
+
+
+def literal(s: str) -> String:
+    """A single-quoted TOML string, as fingerings are written"""
+    return tomlkit.string(s, literal=True)
@@ -0,0 +1,205 @@
+"""
+Map which of the possible button combinations of a system produce a note.
+
+Rather than trying every one of the 2**n states, states are counted press by
+press: ignored buttons and presses without "core" buttons only multiply the
+counts, and modifier offsets are combined by convolution, so the cost depends
+on the number of fingerings and presses, not the number of states.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import itertools
+import sys
+from collections import Counter
+from collections.abc import Iterator, Mapping, Sequence
+from functools import cached_property
+from pathlib import Path
+from typing import NamedTuple
+
+from .exit import Exit
+from .fingering_system import Button, FingeringSystem
+from .note import Note
+from .render_chart import load_system
+
+Offsets = Counter[int]  # For each total modifier offset, the number of states
+
+
+class CoverageReport(NamedTuple):
+    states: int  # All states considered
+    covered: int  # States that produce a note
+    notes: dict[int, int]  # For each note_number, the number of states producing it
+    ambiguous: dict[int, set[int]]  # Core masks defined as more than one note
+
+    @property
+    def dead(self) -> int:
+        return self.states - self.covered
+
+    def __str__(self) -> str:
+        percent = 100 * self.covered / (self.states or 1)
+        lines = [
+            f'States:  {self.states}',
+            f'Covered: {self.covered} ({percent:.2f}%)',
+            f'Dead:    {self.dead}',
+        ]
+        lines += (f'  {Note.from_number(k)!s:8}{v}' for k, v in self.notes.items())
+        return '\n'.join(lines)
+
+
+@dc.dataclass(frozen=True)
+class Coverage:
+    fs: FingeringSystem
+
+    ignore: Sequence[str] = ()  # Buttons that never change the note
+    modifiers: Mapping[str, int] = dc.field(default_factory=dict)  # In semitones
+
+    # If false, count all 2**n states, even those that press two buttons with
+    # the same finger
+    possible_only: bool = True
+
+    @cached_property
+    def offsets(self) -> dict[Button, int]:
+        return {self.fs.to_button[k]: v for k, v in self.modifiers.items()}
+
+    @cached_property
+    def core(self) -> int:
+        """The mask of buttons that select a fingering"""
+        free = {self.fs.to_button[b] for b in self.ignore} | set(self.offsets)
+        return sum(v for k, v in self.fs.bits.items() if k not in free)
+
+    @cached_property
+    def presses(self) -> dict[str, list[Button]]:
+        presses: dict[str, list[Button]] = {}
+        for b in self.fs.all:
+            presses.setdefault(b.press, []).append(b)
+        return presses
+
+    @cached_property
+    def options(self) -> dict[str, dict[int, Offsets]]:
+        """For each press and each of its core masks, the modifier offsets"""
+        options = {}
+        for press, buttons in self.presses.items():
+            any_ = not self.possible_only or press in self.fs.press_groups
+            sizes = range(len(buttons) + 1) if any_ else range(2)
+            choices: dict[int, Offsets] = {}
+            for size in sizes:
+                for chosen in itertools.combinations(buttons, size):
+                    core = self.fs.mask(chosen) & self.core
+                    offset = sum(self.offsets.get(b, 0) for b in chosen)
+                    choices.setdefault(core, Counter())[offset] += 1
+            options[press] = choices
+        return options
+
+    @cached_property
+    def table(self) -> dict[int, set[int]]:
+        """For each core mask, the notes its fingerings define, before modifiers"""
+        table: dict[int, set[int]] = {}
+        for note, fingerings in self.fs.alternates.items():
+            for f in fingerings:
+                offset = sum(self.offsets.get(b, 0) for b in f)
+                core = self.fs.mask(f) & self.core
+                table.setdefault(core, set()).add(note.note_number - offset)
+        return table
+
+    @cached_property
+    def _fixed(self) -> Offsets:
+        """The offsets from all the presses without core buttons"""
+        result = Counter({0: 1})
+        for press, choices in self.options.items():
+            if list(choices) == [0]:
+                result = _convolve(result, choices[0])
+        return result
+
+    @cached_property
+    def _varying(self) -> dict[str, int]:
+        """The presses with core buttons, and their core masks"""
+        masks = {
+            p: sum(self.fs.bits[b] for b in v) & self.core
+            for p, v in self.presses.items()
+        }
+        return {p: m for p, m in masks.items() if m}
+
+    def resolve(self, core: int) -> Offsets:
+        """The number of states with this core mask, for each modifier offset"""
+        result = self._fixed
+        for press, mask in self._varying.items():
+            if not (offsets := self.options[press].get(core & mask)):
+                return Counter()
+            result = _convolve(result, offsets)
+        return result
+
+    def report(self) -> CoverageReport:
+        states = sum(self.resolve_all().values())
+        covered = 0
+        notes: Counter[int] = Counter()
+        for core, defined in self.table.items():
+            base = min(defined)  # If ambiguous, the lowest note wins
+            for offset, count in self.resolve(core).items():
+                notes[base + offset] += count
+                covered += count
+
+        ambiguous = {k: v for k, v in self.table.items() if len(v) > 1}
+        return CoverageReport(states, covered, dict(sorted(notes.items())), ambiguous)
+
+    def resolve_all(self) -> Offsets:
+        """The offsets of every state, covered or not"""
+        result = self._fixed
+        for press in self._varying:
+            every: Offsets = Counter()
+            for offsets in self.options[press].values():
+                every.update(offsets)
+            result = _convolve(result, every)
+        return result
+
+    def dead_zones(self) -> Iterator[list[Button]]:
+        """Yield the core buttons of each combination that produces no note"""
+        presses = list(self._varying)
+        for cores in itertools.product(*(self.options[p] for p in presses)):
+            if (core := sum(cores)) not in self.table:
+                yield [b for b in self.fs.all if self.fs.bits[b] & core]
+
+
+def _convolve(a: Offsets, b: Offsets) -> Offsets:
+    result: Offsets = Counter()
+    for i, m in a.items():
+        for j, n in b.items():
+            result[i + j] += m * n
+    return result
+
+
+def coverage(
+    config_files: list[Path],
+    /,
+    ignore: tuple[str, ...] = (),
+    modifiers: dict[str, int] | None = None,
+    all_states: bool = False,
+    dead_zones: int = 20,
+) -> None:
+    """Report which button combinations produce a note.
+
+    `ignore` lists buttons that never change the note, and `modifiers` buttons
+    that raise or lower it by some semitones. Print at most `dead_zones`
+    combinations of the other buttons which produce no note.
+    """
+    fs, _ = load_system(config_files)
+    modifiers = modifiers or {}
+    if bad := [b for b in (*ignore, *modifiers) if b not in fs.to_button]:
+        raise Exit(f'Unknown button: {", ".join(bad)}')
+
+    cov = Coverage(fs, ignore, modifiers, possible_only=not all_states)
+    report = cov.report()
+
+    print(report)
+    for core, notes in report.ambiguous.items():
+        names = ', '.join(str(Note.from_number(n)) for n in sorted(notes))
+        print('Ambiguous:', _names(cov, core), names, file=sys.stderr)
+
+    if dead_zones and report.dead:
+        print('Dead zones:')
+        for buttons in itertools.islice(cov.dead_zones(), dead_zones):
+            print(' ', ' '.join(b.short_name for b in buttons) or '(none)')
+
+
+def _names(cov: Coverage, mask: int) -> str:
+    return ' '.join(b.short_name for b in cov.fs.all if cov.fs.bits[b] & mask)
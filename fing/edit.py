@@ -0,0 +1,263 @@
+"""
+Edit fingering system TOML documents in bulk, keeping their formatting.
+
+A batch of edits is applied in a single pass over the `fingerings` table,
+the result is validated once, and only the strings that actually changed are
+rewritten, keeping their quoting and column alignment.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, TypeAlias
+
+import tomlkit
+from tomlkit.container import Container
+from tomlkit.items import String, Table
+
+from . import fingering_system
+from .columns import Columns
+from .error_maker import ErrorMaker
+from .fingering_system import Button, FingeringSystem
+from .note import Note
+
+
+@dc.dataclass(frozen=True)
+class RenameButton:
+    """Give a button a new short_name everywhere it is used"""
+
+    button: str
+    short_name: str
+
+
+@dc.dataclass(frozen=True)
+class ReorderButtons:
+    """Change the order of `all`, and so of every fingering"""
+
+    buttons: Sequence[str]
+
+
+@dc.dataclass(frozen=True)
+class AddButton:
+    """Press a button in every fingering that matches `notes` and `having`"""
+
+    button: str
+    notes: Sequence[str] = ()  # If empty, match every note
+    having: Sequence[str] = ()  # Only match fingerings pressing all of these
+
+
+@dc.dataclass(frozen=True)
+class RemoveButton:
+    """Release a button in every fingering that matches `notes` and `having`"""
+
+    button: str
+    notes: Sequence[str] = ()
+    having: Sequence[str] = ()
+
+
+@dc.dataclass(frozen=True)
+class RespellNote:
+    """Change the name of a note, e.g. from 'Gb1' to 'F#1'.
+
+    A name like 'F#1' needs a quoted key, so it is refused in aligned tables.
+    """
+
+    note: str
+    name: str
+
+
+Edit: TypeAlias = RenameButton | ReorderButtons | AddButton | RemoveButton | RespellNote
+
+
+def edit(
+    doc: tomlkit.TOMLDocument, edits: Sequence[Edit], check_button_order: bool = True
+) -> FingeringSystem:
+    """Apply `edits` to `doc` in place, then validate and return the result"""
+    with ErrorMaker() as err:
+        if not isinstance(table := doc.get('fingerings'), dict):
+            err.fail('No fingerings table')
+        if not isinstance(buttons_ := doc.get('buttons'), dict):
+            err.fail('No buttons table')
+        assert isinstance(table, dict) and isinstance(buttons_, dict)
+
+        buttons = {
+            k: Button(k, v['short_name'], v['press']) for k, v in buttons_.items()
+        }
+        to_name = {b.short_name: k for k, b in buttons.items()} | {
+            k: k for k in buttons
+        }
+
+        def name(button: str) -> str:
+            if button not in to_name:
+                err.fail('Unknown button', button)
+            return to_name[button]
+
+        def names(buttons: Iterable[str]) -> list[str]:
+            return [to_name.get(b, b) for b in buttons]
+
+        all_ = names(str(table.get('all', '')).split())
+        old_all = [buttons[n] for n in all_ if n in buttons]
+        columns = Columns.detect(old_all, _strings(table.values()))
+
+        # First, the changes to buttons and `all`
+        short = {k: b.short_name for k, b in buttons.items()}
+        respell: dict[int, str] = {}
+        changes = []
+        for e in edits:
+            if isinstance(e, RenameButton):
+                short[name(e.button)] = e.short_name
+                _set_string(buttons_[name(e.button)], 'short_name', e.short_name)
+            elif isinstance(e, ReorderButtons):
+                if sorted(order := [name(b) for b in e.buttons]) != sorted(all_):
+                    err.fail('Reordering must contain every button', e.buttons)
+                all_ = order
+            elif isinstance(e, RespellNote):
+                note, spelling = _note(err, e.note), _note(err, e.name)
+                if note != spelling:
+                    err.fail('Respelling changes the pitch', e.note, e.name)
+                respell[note.note_number] = e.name
+            else:
+                notes = {Note(n).note_number for n in e.notes}
+                changes.append((e, name(e.button), notes, {name(b) for b in e.having}))
+
+        renamed = {k for k, v in short.items() if v != buttons[k].short_name}
+        index = {n: i for i, n in enumerate(all_)}
+        old_columns = columns
+        if columns:
+            new_all = [
+                dc.replace(buttons[n], short_name=short[n])
+                for n in all_
+                if n in buttons
+            ]
+            columns = Columns.make(new_all, columns.by_press, columns.width)
+
+        # A wider or reordered layout moves every aligned fingering
+        relayout = bool(
+            old_columns
+            and columns
+            and (
+                columns.width != old_columns.width
+                or any(columns.columns[n] != old_columns.columns[n] for n in all_)
+            )
+        )
+
+        # Respelled keys are checked before anything in the table changes
+        new_keys = {}
+        for key in table:
+            if key != 'all' and (spelling := respell.get(_note_number(key))):
+                if (new_key := _spell(spelling, key)) != key:
+                    new_keys[key] = new_key
+        if taken := [v for v in new_keys.values() if v in table]:
+            err.fail('Respelled note is already in the table', *taken)
+        if columns and (quoted := [v for v in new_keys.values() if not _bare(v)]):
+            err.fail('A quoted key would break the column alignment', *quoted)
+
+        def format(pressed: list[str], aligned: bool = True) -> str:
+            tokens = [short.get(n, n) for n in pressed]
+            return columns.format(tokens) if columns and aligned else ' '.join(tokens)
+
+        # Then a single pass over all the fingerings
+        for key, value in list(table.items()):
+            if key == 'all':
+                if all_ != names(value.split()) or renamed:
+                    aligned = bool(columns and not columns.by_press)
+                    table[key] = _string(value, format(all_, aligned))
+                continue
+
+            try:
+                note = Note(key)
+            except Exception as e:
+                err('Invalid note', key, e)
+                continue
+            values = value if isinstance(value, list) else [value]
+            changed = False
+            for i, v in enumerate(values):
+                old = names(v.split())
+                pressed = old
+                for e, button, notes, having in changes:
+                    if notes and note.note_number not in notes:
+                        continue
+                    if not having.issubset(pressed):
+                        continue
+                    if isinstance(e, AddButton) and button not in pressed:
+                        pressed = [*pressed, button]
+                    elif isinstance(e, RemoveButton) and button in pressed:
+                        pressed = [p for p in pressed if p != button]
+
+                pressed = sorted(pressed, key=lambda n: index.get(n, len(index)))
+                moved = relayout and old_columns and old_columns.format(v.split()) == v
+                if pressed != old or renamed.intersection(pressed) or moved:
+                    values[i] = _string(v, format(pressed))
+                    changed = True
+
+            if changed and not isinstance(value, list):
+                table[key] = values[0]
+
+        if new_keys:
+            doc['fingerings'] = _rename_keys(table, new_keys)
+
+    return fingering_system.make(tomlkit.parse(doc.as_string()), check_button_order)
+
+
+def edit_file(path: Path, edits: Sequence[Edit], write: bool = True) -> FingeringSystem:
+    """Edit a fingering TOML file, writing it back only if it is valid"""
+    doc = tomlkit.parse(path.read_text())
+    fs = edit(doc, edits)
+    if write:
+        path.write_text(doc.as_string())
+    return fs
+
+
+def edit_files(
+    paths: Iterable[Path], edits: Sequence[Edit], write: bool = True
+) -> dict[Path, FingeringSystem]:
+    return {p: edit_file(p, edits, write) for p in paths}
+
+
+def _spell(name: str, like: str) -> str:
+    # Keep the column padding in keys like 'C_1'
+    if '_' in like and len(note := name.rstrip('0123456789-')) == 1:
+        return note + '_' + name[1:]
+    return name
+
+
+def _note(err: ErrorMaker, name: str) -> Note:
+    try:
+        return Note(name)
+    except Exception as e:
+        err.fail('Invalid note', name, e)
+
+
+def _note_number(key: str) -> int | None:
+    try:
+        return Note(key).note_number
+    except Exception:
+        return None  # Reported in the pass over the fingerings
+
+
+def _bare(key: str) -> bool:
+    return all(c.isascii() and (c.isalnum() or c in '_-') for c in key)
+
+
+def _rename_keys(table: Table, new_keys: dict[str, str]) -> Table:
+    # Rebuild the table in order, as tomlkit can't rename a key in place
+    body = Container(True)
+    for k, v in table.value.body:
+        if k is not None and k.key in new_keys:
+            k = tomlkit.key(new_keys[k.key])
+        body.append(k, v)
+    return Table(body, table.trivia, table.is_aot_element(), table.is_super_table())
+
+
+def _string(old: Any, new: str) -> Any:
+    return String.from_raw(new, old.type) if isinstance(old, String) else new
+
+
+def _set_string(table: dict[str, Any], key: str, value: str) -> None:
+    table[key] = _string(table[key], value)
+
+
+def _strings(values: Iterable[Any]) -> list[str]:
+    return [s for v in values for s in ([v] if isinstance(v, str) else v)]
@@ -0,0 +1,2 @@
+class Exit(Exception):
+    """Print an error and exit with status 1, from any `fing` command"""
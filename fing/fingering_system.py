@@ -3,14 +3,18 @@ from __future__ import annotations
 import dataclasses as dc
 from collections.abc import Sequence
 from functools import cached_property
-from typing import TypeAlias
-
-import tomlkit
+from typing import TYPE_CHECKING, TypeAlias
 
+from .cached import compute_all
 from .error_maker import ErrorMaker
 from .fix_input_variables import fix_input_variables
 from .note import Note
 
+if TYPE_CHECKING:
+    import tomlkit
+
+    from .matrix import FingeringMatrix
+
 
 @dc.dataclass(frozen=True)
 class Button:
@@ -22,11 +26,13 @@ class Button:
 
 Fingering: TypeAlias = Sequence[Button]
 Fingerings: TypeAlias = dict[Note, Fingering]
+Alternates: TypeAlias = dict[Note, list[Fingering]]
 
 
 @dc.dataclass(frozen=True)
 class FingeringSystem:
-    fingerings_: dict[str, str]
+    # A note's value is either one fingering or a list of alternate fingerings
+    fingerings_: dict[str, str | list[str]]
     buttons_: dict[str, dict[str, str]]
     lowest_c_: dict[str, str]
     metadata: dict[str, str]
@@ -41,12 +47,35 @@ class FingeringSystem:
 
     @cached_property
     def all(self) -> Fingering:
-        return self._all_fingerings[0]
+        # Only the `all` entry is read, so the other fingerings can stay lazy
+        all_: Fingering = ()
+        for fingering in _values(self.fingerings_.get('all', [])):
+            if parsed := self.parse_fingering('all', fingering):
+                all_ = parsed[1]
+        return all_
 
     @cached_property
     def fingerings(self) -> Fingerings:
+        return {k: v[0] for k, v in self.alternates.items()}
+
+    @cached_property
+    def alternates(self) -> Alternates:
         return self._all_fingerings[1]
 
+    @cached_property
+    def bits(self) -> dict[Button, int]:
+        return {b: 1 << i for i, b in enumerate(self.all)}
+
+    def mask(self, fingering: Fingering) -> int:
+        return sum(self.bits[b] for b in fingering)
+
+    @cached_property
+    def matrix(self) -> FingeringMatrix:
+        """Every fingering, including alternates, as numpy arrays"""
+        from .matrix import FingeringMatrix
+
+        return FingeringMatrix.make(self)
+
     @cached_property
     def buttons(self) -> dict[str, Button]:
         buttons: dict[str, Button] = {}
@@ -73,6 +102,77 @@ class FingeringSystem:
     def to_button(self) -> dict[str, Button]:
         return {v.short_name: v for v in self.buttons.values()} | self.buttons
 
+    @cached_property
+    def note_keys(self) -> dict[Note, str]:
+        """The key of each note in `fingerings_`, without reading any fingerings"""
+        keys: dict[Note, str] = {}
+        for k in self.fingerings_:
+            if k != 'all':
+                try:
+                    keys[Note(k)] = k
+                except Exception as e:
+                    self.err('Invalid note', k, e)
+        return keys
+
+    def fingerings_for(self, note: Note | str) -> list[Fingering]:
+        """The fingerings of one note, which are only read when first asked for"""
+        if isinstance(note, str):
+            note = Note(note)
+        if 'alternates' in self.__dict__:
+            return self.alternates.get(note, [])
+        if (k := self.note_keys.get(note)) is None:
+            return []
+
+        if (found := self._parsed.get(note)) is None:
+            value = self.fingerings_[k]
+            parsed = (self.parse_fingering(k, f) for f in _values(value))
+            found = self._parsed[note] = [p[1] for p in parsed if p]
+        return found
+
+    def select(
+        self,
+        low: Note | str | None = None,
+        high: Note | str | None = None,
+        instrument: str | None = None,
+        using: Sequence[str] = (),
+    ) -> Alternates:
+        """The fingerings of the notes between `low` and `high`, inclusive.
+
+        If `instrument` is a key of `lowest_c`, `low` and `high` are pitches
+        that instrument sounds. If `using` names some buttons, only notes with
+        a fingering that presses all of them are kept, and only those
+        fingerings. Only the notes in the range are read.
+        """
+        offset = self.transposition(instrument) if instrument else 0
+        low_, high_ = (
+            n if n is None or isinstance(n, Note) else Note(n) for n in (low, high)
+        )
+        if bad := [b for b in using if b not in self.to_button]:
+            self.err('Unknown button', *bad)
+        buttons = {self.to_button[b] for b in using if b in self.to_button}
+
+        selected: Alternates = {}
+        for note in self.note_keys:
+            sounding = note.note_number + offset
+            if low_ and sounding < low_.note_number:
+                continue
+            if high_ and sounding > high_.note_number:
+                continue
+            fingerings = self.fingerings_for(note)
+            if buttons:
+                fingerings = [f for f in fingerings if buttons.issubset(f)]
+            if fingerings:
+                selected[note] = fingerings
+        return selected
+
+    def transposition(self, instrument: str) -> int:
+        """How many semitones above the chart an instrument sounds"""
+        if (lowest := self.lowest_c.get(instrument)) is None:
+            self.err.fail('Unknown instrument', instrument)
+        # The lowest C in the chart, even if the chart starts below it
+        lowest_note = min(self.note_keys, default=lowest).note_number
+        return lowest.note_number - 12 * -(-lowest_note // 12)
+
     def check(self, check_button_order: bool = False) -> None:
         with self.err:
             shorts = (k.short_name for k in self.buttons.values())
@@ -80,13 +180,23 @@ class FingeringSystem:
 
             if check_button_order:
                 self.test_button_order()
-            for v in vars(self).values():
-                if isinstance(v, cached_property):
-                    getattr(self, v)
+            self.freeze()
+
+    def freeze(self) -> FingeringSystem:
+        """Compute all the properties now, raising any errors in the system.
+
+        After this, reading the system doesn't change it, with two exceptions:
+        `matrix` needs numpy, so it is still computed when first read, and `err`
+        records any later errors, like an unknown button given to `select()`.
+        To share a system between threads, read `matrix` first if it is needed.
+        """
+        with self.err:
+            compute_all(self, _OPTIONAL)
+        return self
 
     def test_button_order(self) -> None:
         inv = {k: i for i, k in enumerate(self.all)}
-        for fingering in self.fingerings.values():
+        for fingering in (f for v in self.alternates.values() for f in v):
             previous = -1
             for button in fingering:
                 last = previous
@@ -96,45 +206,81 @@ class FingeringSystem:
                     break
 
     @cached_property
-    def _all_fingerings(self) -> tuple[Fingering, Fingerings]:
-        all_: Fingering = ()
-        fingerings: dict[Note, Fingering] = {}
+    def _parsed(self) -> dict[Note, list[Fingering]]:
+        # The fingerings read so far by fingerings_for()
+        return {}
 
-        for k, fingering in self.fingerings_.items():
-            pressed = fingering.split()
-            self.err.test_dupes('Duplicate buttons in fingering', pressed, k)
-
-            if bad_notes := [i for i in pressed if i not in self.to_button]:
-                self.err('Unknown note', k, bad_notes)
-                continue
+    @cached_property
+    def _all_fingerings(self) -> tuple[Fingering, Alternates]:
+        alternates: Alternates = {}
 
-            buttons_pressed = [self.to_button[n] for n in pressed]
+        for k, value in self.fingerings_.items():
             if k == 'all':
-                all_ = buttons_pressed
                 continue
+            for fingering in _values(value):
+                if (parsed := self.parse_fingering(k, fingering)) is None:
+                    continue
+                note, buttons_pressed = parsed
+                if note is not None:
+                    alternates.setdefault(note, []).append(buttons_pressed)
+        return self.all, alternates
 
-            if not self.allow_impossible_fingerings:
-                if conflicts := self._fingering_conflicts(buttons_pressed):
-                    self.err('Impossive fingerings', k, conflicts)
+    def parse_fingering(
+        self, k: str, fingering: str, err: ErrorMaker | None = None
+    ) -> tuple[Note | None, Fingering] | None:
+        """Check one fingering for the note `k`, or for `all`.
 
-            try:
-                note = Note(k)
-            except Exception as e:
-                self.err('Invalid note', k, e)
-                continue
+        Return the note, or None for `all`, and the buttons pressed, or None
+        if the fingering can't be read. Errors go to `err`, or `self.err`.
+        """
+        err = self.err if err is None else err
+        pressed = fingering.split()
+        err.test_dupes('Duplicate buttons in fingering', pressed, k)
+
+        if bad_buttons := [i for i in pressed if i not in self.to_button]:
+            err('Unknown button', k, bad_buttons)
+            return None
+
+        buttons_pressed = [self.to_button[n] for n in pressed]
+        if k == 'all':
+            return None, buttons_pressed
+
+        if not self.allow_impossible_fingerings:
+            if conflicts := self.conflicts(buttons_pressed):
+                names = {p: [b.short_name for b in v] for p, v in conflicts.items()}
+                err('Impossible fingering', k, names)
+
+        try:
+            note = Note(k)
+        except Exception as e:
+            err('Invalid note', k, e)
+            return None
 
-            fingerings[note] = buttons_pressed
-        return all_, fingerings
+        return note, buttons_pressed
 
-    def _fingering_conflicts(self, fingering: Fingering) -> dict[str, list[Button]]:
+    def conflicts(self, fingering: Fingering) -> dict[str, list[Button]]:
         d = {}
         for b in fingering:
-            if b not in self.press_groups:
+            if b.press not in self.press_groups:
                 d.setdefault(b.press, []).append(b)
         return {k: v for k, v in d.items() if len(v) > 1}
 
 
-def make(doc: tomlkit.TOMLDocument, check_button_order: bool = True) -> FingeringSystem:
+_OPTIONAL = ('matrix',)  # Needs numpy, so it is only computed when asked for
+
+
+def _values(value: str | list[str]) -> list[str]:
+    return [value] if isinstance(value, str) else value
+
+
+def make(
+    doc: tomlkit.TOMLDocument, check_button_order: bool = True, lazy: bool = False
+) -> FingeringSystem:
+    """Make a FingeringSystem, and check all of it, unless `lazy` is true.
+
+    A lazy system reads and checks each note's fingerings when they are first
+    used: call `check()` to check everything.
+    """
     with ErrorMaker() as err:
         fix_input_variables(doc, FingeringSystem)
         names = {f.name for f in dc.fields(FingeringSystem)}
@@ -143,5 +289,6 @@ def make(doc: tomlkit.TOMLDocument, check_button_order: bool = True) -> Fingerin
 
         assert isinstance(doc, dict)
         fs = FingeringSystem(err=err, document=doc, **doc)  # ty: ignore[invalid-argument-type]
-        fs.check(check_button_order)
+        if not lazy:
+            fs.check(check_button_order)
         return fs
@@ -0,0 +1,223 @@
+"""
+Infer the fingerings of a system from logs of (button state, sounding note)
+samples, streaming through the logs and only counting each distinct pair.
+
+Each log line is `state,note` or `state note`. The state is either an integer
+mask, with bit `i` meaning that button `i` of `all` is pressed, or a list of
+buttons separated by `+` or spaces. The note is a note name, or an integer
+note number in `fing`'s numbering, where C1 is 12.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import sys
+import tomllib
+from collections import Counter
+from collections.abc import Iterable
+from functools import cached_property
+from pathlib import Path
+from typing import NamedTuple
+
+import tomlkit
+from tomlkit.items import Table
+
+from . import fingering_system
+from .columns import Columns, literal, note_key
+from .exit import Exit
+from .fingering_system import Button, FingeringSystem
+from .note import Note
+
+MAX_ERRORS = 20
+
+
+class Fingering(NamedTuple):
+    mask: int
+    note_number: int
+    count: int
+    confidence: float  # The share of this mask's samples that sounded this note
+
+
+@dc.dataclass(frozen=True)
+class Inference:
+    fs: FingeringSystem
+    min_count: int = 1
+    min_confidence: float = 0.5
+
+    counts: Counter[tuple[int, int]] = dc.field(default_factory=Counter)
+    errors: list[str] = dc.field(default_factory=list)
+    error_count: Counter[str] = dc.field(default_factory=Counter)
+
+    @cached_property
+    def to_bits(self) -> dict[str, int]:
+        return {
+            k: self.fs.bits[b]
+            for k, b in self.fs.to_button.items()
+            if b in self.fs.bits
+        }
+
+    def read(self, lines: Iterable[str], source: str = '') -> None:
+        for i, line in enumerate(lines):
+            if not (line := line.strip()) or line.startswith('#'):
+                continue
+            try:
+                self.counts[self._sample(line)] += 1
+            except ValueError as e:
+                self.error_count[source] += 1
+                if len(self.errors) < MAX_ERRORS:
+                    self.errors.append(f'{source}:{i + 1}: {e}: {line}')
+
+    @property
+    def masks(self) -> dict[int, Counter[int]]:
+        masks: dict[int, Counter[int]] = {}
+        for (mask, note_number), count in self.counts.items():
+            masks.setdefault(mask, Counter())[note_number] += count
+        return masks
+
+    def fingerings(self) -> tuple[dict[int, list[Fingering]], list[Fingering]]:
+        """Return the fingerings for each note, and the rejected fingerings"""
+        notes: dict[int, list[Fingering]] = {}
+        rejected = []
+        for mask, counter in self.masks.items():
+            total = counter.total()
+            for i, (note_number, count) in enumerate(counter.most_common()):
+                f = Fingering(mask, note_number, count, count / total)
+                if i or count < self.min_count or f.confidence < self.min_confidence:
+                    rejected.append(f)
+                elif not self._possible(mask):
+                    rejected.append(f)
+                else:
+                    notes.setdefault(note_number, []).append(f)
+
+        for v in notes.values():
+            v.sort(key=lambda f: (-f.count, f.mask))
+        return dict(sorted(notes.items())), rejected
+
+    def contradictions(self) -> dict[int, Counter[int]]:
+        """Masks that sounded more than one note"""
+        return {k: v for k, v in self.masks.items() if len(v) > 1}
+
+    def document(self, source: tomlkit.TOMLDocument) -> tomlkit.TOMLDocument:
+        """A copy of `source` with its fingerings replaced by the inferred ones"""
+        doc = tomlkit.parse(source.as_string())
+
+        columns = Columns.make(self.fs.all, by_press=True)
+        table = tomlkit.table()
+        table['all'] = literal(' '.join(b.short_name for b in self.fs.all))
+        table.add(tomlkit.comment('Each fingering has a count of samples @ confidence'))
+
+        notes, _ = self.fingerings()
+        for note_number, fingerings in notes.items():
+            counts = ', '.join(f'{f.count} @ {f.confidence:.2f}' for f in fingerings)
+            table.add(tomlkit.comment(counts))
+            values = [literal(self._format(columns, f.mask)) for f in fingerings]
+            table[note_key(note_number)] = values[0] if len(values) == 1 else values
+
+        # Keep what follows the last fingering, like comments on the next table
+        if isinstance(old := doc.get('fingerings'), Table):
+            body = old.value.body
+            last = max((i for i, (k, _) in enumerate(body) if k), default=-1)
+            for _, item in body[last + 1 :]:
+                table.value.append(None, item)
+        doc['fingerings'] = table
+        return doc
+
+    @cached_property
+    def _all_mask(self) -> int:
+        return (1 << len(self.fs.all)) - 1
+
+    def _format(self, columns: Columns, mask: int) -> str:
+        return columns.format([b.short_name for b in self._buttons(mask)])
+
+    def _buttons(self, mask: int) -> list[Button]:
+        return [b for b in self.fs.all if self.fs.bits[b] & mask]
+
+    def _possible(self, mask: int) -> bool:
+        fs = self.fs
+        return fs.allow_impossible_fingerings or not fs.conflicts(self._buttons(mask))
+
+    def _sample(self, line: str) -> tuple[int, int]:
+        if ',' in line:
+            state, _, note = line.rpartition(',')
+        else:
+            state, _, note = line.rpartition(' ')
+        note = note.strip()
+        note_number = int(note) if note.lstrip('-').isdigit() else _note(note)
+
+        try:
+            mask = int(state, 0)
+        except ValueError:
+            buttons = state.replace('+', ' ').split()
+            if bad := [b for b in buttons if b not in self.to_bits]:
+                raise ValueError(f'Unknown button {bad}') from None
+            mask = sum({self.to_bits[b] for b in buttons})
+        else:
+            if mask < 0 or mask > self._all_mask:
+                raise ValueError('Bad mask')
+        return mask, note_number
+
+
+def infer(
+    system: Path,
+    logs: list[Path],
+    /,
+    output: Path | None = None,
+    min_count: int = 1,
+    min_confidence: float = 0.5,
+) -> None:
+    """Infer fingerings from logs of button states and notes.
+
+    The buttons and everything but the fingerings come from the `system` file.
+    A log named `-` is read from stdin.
+    """
+    try:
+        text = system.read_text()
+        fs = fingering_system.make(tomllib.loads(text))  # ty: ignore[invalid-argument-type]
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise Exit(f'{system}: {e}') from None
+
+    inference = Inference(fs, min_count, min_confidence)
+    for log in logs:
+        if str(log) == '-':
+            inference.read(sys.stdin, '<stdin>')
+        else:
+            with log.open() as fp:
+                inference.read(fp, str(log))
+
+    doc = inference.document(tomlkit.parse(text))
+    fingering_system.make(tomlkit.parse(doc.as_string()))  # Check it is valid
+
+    _report(inference)
+    if output is None:
+        print(doc.as_string(), end='')
+    else:
+        output.write_text(doc.as_string())
+
+
+def _report(inference: Inference) -> None:
+    def buttons(mask: int) -> str:
+        return ' '.join(b.short_name for b in inference._buttons(mask)) or '(none)'
+
+    def p(*args: object, sep: str = ' ') -> None:
+        print(*args, sep=sep, file=sys.stderr)
+
+    p(f'Read {inference.counts.total()} samples')
+    if count := inference.error_count.total():
+        p(f'{count} bad line(s):', *inference.errors, sep='\n  ')
+
+    for mask, counter in inference.contradictions().items():
+        notes = ', '.join(f'{note_key(n)} x {c}' for n, c in counter.most_common())
+        p(f'Contradiction: {buttons(mask)}: {notes}')
+
+    impossible = {
+        m: c for m, c in inference.masks.items() if not inference._possible(m)
+    }
+    for mask, counter in impossible.items():
+        p(f'Impossible: {buttons(mask)}: {note_key(counter.most_common(1)[0][0])}')
+
+
+def _note(name: str) -> int:
+    try:
+        return Note(name).note_number
+    except Exception:
+        raise ValueError(f'Bad note {name!r}') from None
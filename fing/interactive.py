@@ -0,0 +1,127 @@
+"""
+Render a fingering chart as a single diagram in an HTML page with a note menu.
+
+Each variant of each piece of the diagram is drawn just once, as a group with
+the class `p{piece}-{variant}`, where variant 0 is the piece's `_off` parts.
+A fingering is encoded as the variants it shows other than the `_off` ones,
+like `data-f="0-1 4-2"`. Picking a note copies its code onto the <svg>, and two
+CSS rules for each variant show it and hide its piece's `_off` group.
+
+So the page grows with the number of notes plus the number of pieces, rather
+than with their product, like the SVG charts.
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses as dc
+import html
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Any
+from xml.etree import ElementTree as ET
+from xml.etree.ElementTree import Element
+
+from .fingering_system import Fingering
+from .layout import Layout
+from .renderer import SVG_NS, add_element
+from .sizes import fingering_size
+
+SVG_ID = 'fingering'
+
+_PAGE = """\
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+{style}
+</style>
+</head>
+<body>
+<select onchange="document.getElementById('{id}').dataset.f = this.value">
+{options}
+</select>
+{svg}
+</body>
+</html>"""
+
+
+@dc.dataclass(frozen=True)
+class InteractiveRenderer:
+    layout: Layout
+    fingerings: Mapping[Any, Fingering]  # Labelled with the str() of each key
+    title: str = 'Fingering chart'
+
+    @cached_property
+    def variants(self) -> list[list[str]]:
+        """For each piece, the names of its parts, starting with `_off`"""
+        return [
+            ['_off', *(k for k in p.parts if k != '_off')] for p in self.layout.pieces
+        ]
+
+    @cached_property
+    def codes(self) -> dict[str, str]:
+        """For each note label, the variants its fingering shows"""
+        return {str(k): self.code(v) for k, v in self.fingerings.items()}
+
+    def code(self, fingering: Fingering) -> str:
+        codes = []
+        for i, (piece, variants) in enumerate(zip(self.layout.pieces, self.variants)):
+            if j := variants.index(piece.part_name(fingering)):
+                codes.append(f'{i}-{j}')
+        return ' '.join(codes)
+
+    @cached_property
+    def style(self) -> str:
+        hidden, rules = [], []
+        for i, variants in enumerate(self.variants):
+            for j in range(1, len(variants)):
+                hidden.append(f'.p{i}-{j}')
+                selector = f'[data-f~="{i}-{j}"]'
+                rules.append(f'{selector} .p{i}-0 {{ display: none; }}')
+                rules.append(f'{selector} .p{i}-{j} {{ display: inline; }}')
+        if hidden:
+            rules.insert(0, f'{", ".join(hidden)} {{ display: none; }}')
+
+        for name, style in self.layout.styles.items():
+            parts = ' '.join(f'{k}: {v};' for k, v in style.items())
+            rules.append(f'.{name} {{ {parts} }}')
+        return '\n'.join(rules)
+
+    @cached_property
+    def svg(self) -> Element:
+        w, h = fingering_size(self.layout)
+        attrs = {'id': SVG_ID, 'viewBox': f'0 0 {w} {h}', 'width': str(w)} | SVG_NS
+        if self.codes:
+            attrs['data-f'] = next(iter(self.codes.values()))
+        svg = Element('svg', attrs)
+        add_element(svg, 'defs').extend(copy.deepcopy(self.layout.defs))
+
+        if 'fingering_background' in self.layout.styles:
+            add_element(
+                svg, 'rect', 'fingering_background', width='100%', height='100%'
+            )
+
+        x, y = self.layout.inset.fingering
+        fingering = add_element(svg, 'svg', 'fingering', x=x, y=y)
+        for i, (piece, variants) in enumerate(zip(self.layout.pieces, self.variants)):
+            for j, name in enumerate(variants):
+                add_element(fingering, 'g', f'p{i}-{j}').extend(piece.render_part(name))
+        return svg
+
+    def __call__(self) -> str:
+        svg = copy.deepcopy(self.svg)
+        ET.indent(svg)
+        options = (
+            f'<option value="{html.escape(v)}">{html.escape(k)}</option>'
+            for k, v in self.codes.items()
+        )
+        return _PAGE.format(
+            title=html.escape(self.title),
+            style=self.style,
+            id=SVG_ID,
+            options='\n'.join(options),
+            svg=ET.tostring(svg, encoding='unicode'),
+        )
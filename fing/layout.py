@@ -9,6 +9,7 @@ import tomlkit
 
 from fing.chart_piece import ChartPiece, Part
 
+from .cached import compute_all
 from .error_maker import ErrorMaker
 from .fingering_system import Button
 from .fix_input_variables import fix_input_variables
@@ -114,6 +115,12 @@ class Layout:
     def footer(self) -> Element:
         return fromstring(self.footer_)
 
+    def freeze(self) -> Layout:
+        """Parse the pieces, defs and labels now, raising any errors"""
+        compute_all(self)
+        self.err.check()
+        return self
+
     @staticmethod
     def make(data: tomlkit.TOMLDocument, to_button: dict[str, Any]) -> Layout:
         with ErrorMaker(reraise=True) as err:
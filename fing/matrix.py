@@ -0,0 +1,210 @@
+"""
+The fingerings of a system as a matrix with one row per fingering and one
+column per button of `all`, for numpy and Arrow.
+
+Needs numpy, and pyarrow for the Arrow and Parquet functions: install them
+with the `matrix` extra, as `pip install fing[matrix]`.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import json
+from collections.abc import Mapping
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from . import fingering_system
+from .fingering_system import FingeringSystem
+from .note import Note
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+_METADATA_KEY = b'fing'
+
+
+@dc.dataclass(frozen=True)
+class FingeringMatrix:
+    """All arrays are read-only, so they can be shared without copying"""
+
+    matrix: np.ndarray  # bool, fingerings x buttons
+    note_numbers: np.ndarray  # int, one for each fingering
+    alternates: np.ndarray  # int, 0 for a note's main fingering, then 1, 2...
+    buttons: np.ndarray  # str, the name of each button
+    short_names: np.ndarray  # str
+    presses: np.ndarray  # str
+    descriptions: np.ndarray  # str
+
+    def __post_init__(self) -> None:
+        for f in dc.fields(self):
+            getattr(self, f.name).flags.writeable = False
+
+    @cached_property
+    def uint8(self) -> np.ndarray:
+        """The matrix as 0s and 1s, sharing memory with `matrix`"""
+        return self.matrix.view(np.uint8)
+
+    @cached_property
+    def packed(self) -> np.ndarray:
+        """The matrix with eight buttons to a byte"""
+        packed = np.packbits(self.matrix, axis=1)
+        packed.flags.writeable = False
+        return packed
+
+    @cached_property
+    def transitions(self) -> np.ndarray:
+        """The transition costs with the default weights"""
+        return self.transition_costs()
+
+    def transition_costs(
+        self, weights: Mapping[str, float] | None = None, same_finger: float = 1.0
+    ) -> np.ndarray:
+        """The cost of moving from each fingering to each other one.
+
+        Each button lifted or pressed costs the weight of its press, 1 by
+        default. A press that lifts one button and presses another, like a
+        finger sliding between keys, costs `same_finger` more.
+        """
+        weights = weights or {}
+        m = self.matrix.astype(np.float32)
+        w = np.array([weights.get(p, 1) for p in self.presses], dtype=np.float32)
+
+        # Buttons moved are |a ^ b| = |a| + |b| - 2|a & b|, weighted
+        pressed = m @ w
+        costs = pressed[:, None] + pressed[None, :] - 2 * ((m * w) @ m.T)
+
+        if same_finger:
+            costs += same_finger * self._slides()
+
+        costs.flags.writeable = False
+        return costs
+
+    def _slides(self) -> np.ndarray:
+        """How many presses lift one button and press another, for each pair"""
+        # A press has few buttons, so a fingering has one of a few patterns on
+        # it. With one column for each pattern of each press, the presses can
+        # be summed in a single product with a block diagonal table
+        onehots, tables = [], []
+        for press in np.unique(self.presses):
+            if (size := int((columns := self.presses == press).sum())) < 2:
+                continue
+            a = np.arange(1 << size)
+            patterns = self.matrix[:, columns] @ (1 << np.arange(size))
+            onehots.append(patterns[:, None] == a)
+            tables.append(((a[:, None] & ~a) != 0) & ((~a[:, None] & a) != 0))
+
+        n = len(self.matrix)
+        if not onehots:
+            return np.zeros((n, n), dtype=np.float32)
+
+        table = np.zeros((sum(len(t) for t in tables),) * 2, dtype=np.float32)
+        start = 0
+        for t in tables:
+            table[start : start + len(t), start : start + len(t)] = t
+            start += len(t)
+        onehot = np.hstack(onehots).astype(np.float32)
+        return (onehot @ table) @ onehot.T
+
+    @staticmethod
+    def make(fs: FingeringSystem) -> FingeringMatrix:
+        index = {b: i for i, b in enumerate(fs.all)}
+        rows = [(n, i, f) for n, v in fs.alternates.items() for i, f in enumerate(v)]
+
+        matrix = np.zeros((len(rows), len(index)), dtype=bool)
+        for r, (_, _, fingering) in enumerate(rows):
+            matrix[r, [index[b] for b in fingering]] = True
+
+        return FingeringMatrix(
+            matrix=matrix,
+            note_numbers=np.array([n.note_number for n, _, _ in rows], dtype=np.int32),
+            alternates=np.array([i for _, i, _ in rows], dtype=np.int32),
+            buttons=np.array([b.name for b in fs.all], dtype=str),
+            short_names=np.array([b.short_name for b in fs.all], dtype=str),
+            presses=np.array([b.press for b in fs.all], dtype=str),
+            descriptions=np.array([b.description for b in fs.all], dtype=str),
+        )
+
+    @staticmethod
+    def from_packed(packed: np.ndarray, **kwargs: Any) -> FingeringMatrix:
+        columns = len(kwargs['buttons'])
+        matrix = np.unpackbits(packed, axis=1, count=columns).astype(bool)
+        return FingeringMatrix(matrix=matrix, **kwargs)
+
+    def to_system(
+        self,
+        lowest_c: Mapping[str, str] | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> FingeringSystem:
+        """Make a new FingeringSystem from this matrix"""
+        columns = self.buttons, self.short_names, self.presses, self.descriptions
+        buttons = {
+            str(b): {'short_name': str(s), 'press': str(p), 'description': str(d)}
+            for b, s, p, d in zip(*columns)
+        }
+        fingerings: dict[str, Any] = {'all': ' '.join(self.short_names)}
+        for row, note_number in zip(self.matrix, self.note_numbers):
+            name = Note.from_number(int(note_number)).name
+            fingering = ' '.join(self.short_names[row])
+            if (previous := fingerings.get(name)) is None:
+                fingerings[name] = fingering
+            elif isinstance(previous, list):
+                previous.append(fingering)
+            else:
+                fingerings[name] = [previous, fingering]
+
+        doc = {
+            'buttons': buttons,
+            'fingerings': fingerings,
+            'lowest_c': dict(lowest_c or {}),
+            'metadata': dict(metadata or {}),
+        }
+        return fingering_system.make(doc)  # ty: ignore[invalid-argument-type]
+
+    def to_arrow(self) -> pa.Table:
+        """A table with a row for each fingering and a bool column for each button"""
+        import pyarrow as pa
+
+        columns = {
+            'note_number': pa.array(self.note_numbers),
+            'alternate': pa.array(self.alternates),
+        }
+        for name, column in zip(self.buttons, self.matrix.T):
+            columns[str(name)] = pa.array(column)
+
+        buttons = {
+            'short_names': self.short_names.tolist(),
+            'presses': self.presses.tolist(),
+            'descriptions': self.descriptions.tolist(),
+        }
+        metadata = {_METADATA_KEY: json.dumps(buttons).encode()}
+        return pa.table(columns, metadata=metadata)
+
+    @staticmethod
+    def from_arrow(table: pa.Table) -> FingeringMatrix:
+        buttons = json.loads(table.schema.metadata[_METADATA_KEY])
+        names = table.column_names[2:]
+        matrix = np.column_stack([table[n].to_numpy() for n in names])
+        return FingeringMatrix(
+            matrix=matrix.reshape(table.num_rows, len(names)).astype(bool),
+            note_numbers=table['note_number'].to_numpy(),
+            alternates=table['alternate'].to_numpy(),
+            buttons=np.array(names, dtype=str),
+            short_names=np.array(buttons['short_names'], dtype=str),
+            presses=np.array(buttons['presses'], dtype=str),
+            descriptions=np.array(buttons['descriptions'], dtype=str),
+        )
+
+    def write_parquet(self, path: Path) -> None:
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path)
+
+    @staticmethod
+    def read_parquet(path: Path) -> FingeringMatrix:
+        import pyarrow.parquet as pq
+
+        return FingeringMatrix.from_arrow(pq.read_table(path))
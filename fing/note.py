@@ -14,6 +14,11 @@ class Note:
         self.octave = int(s[len(self.note) :])
         self.note_number = 12 * self.octave + NOTE_TO_OFFSET[self.note]
 
+    @staticmethod
+    def from_number(note_number: int) -> Note:
+        octave, offset = divmod(note_number, 12)
+        return Note(f'{_offset_to_notes()[offset][-1]}{octave}')
+
     @property
     def full_name(self) -> str:
         name = '/'.join(_offset_to_notes()[self.note_number % 12])
@@ -0,0 +1,57 @@
+"""
+Split a chart into pages, either with a fixed number of notes per page, or
+with as many notes as fit on a page of a given size.
+
+Pages are rendered and serialized one at a time, so only one page is ever in
+memory.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import itertools
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any
+
+from .fingering_system import Fingering
+from .layout import Layout
+from .renderer import Renderer
+from .sizes import Size, Sizes
+from .xml_to_str import xml_to_str
+
+
+def page_layout(layout: Layout, page_size: Size) -> tuple[Layout, int]:
+    """Return a layout with as many rows as fit on a page, and the notes per page"""
+    width, height = page_size
+    columns = _most(lambda n: Sizes(layout, n, 1).document.width <= width)
+    rows = _most(lambda n: Sizes(layout, 1, n).document.height <= height)
+    if not (columns and rows):
+        smallest = Sizes(layout, 1, 1).document
+        raise ValueError(f'A page must be at least {smallest.width}x{smallest.height}')
+    return dc.replace(layout, rows=rows), columns * rows
+
+
+def pages(
+    layout: Layout,
+    fingerings: Mapping[Any, Fingering],
+    notes_per_page: int | None = None,
+    page_size: Size | None = None,
+    compact: bool = False,
+) -> Iterator[str]:
+    """Yield each page of the chart as an SVG document"""
+    if page_size is not None:
+        layout, most = page_layout(layout, page_size)
+        notes_per_page = min(notes_per_page or most, most)
+    if not notes_per_page or notes_per_page < 1:
+        raise ValueError('Need a page size or a positive number of notes per page')
+
+    items = iter(fingerings.items())
+    while page := dict(itertools.islice(items, notes_per_page)):
+        lo = layout if len(page) >= layout.rows else dc.replace(layout, rows=len(page))
+        renderer = Renderer(lo, page, compact)
+        yield xml_to_str(renderer(), indent=not compact)
+
+
+def _most(fits: Callable[[int], bool], limit: int = 1024) -> int:
+    """The largest n <= limit where fits(n), given that sizes grow with n"""
+    return next((n for n in range(1, limit + 1) if not fits(n)), limit + 1) - 1
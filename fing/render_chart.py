@@ -1,36 +1,134 @@
 import sys
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
 import tomlkit
 
 from fing import fingering_system
+from fing.error_maker import ErrorMakerException
+from fing.exit import Exit
+from fing.fingering_system import Fingering, FingeringSystem
+from fing.interactive import InteractiveRenderer
 from fing.layout import Layout
+from fing.note import Note
+from fing.pages import pages
 from fing.renderer import Renderer
+from fing.sizes import Size
 from fing.xml_to_str import xml_to_str
 
 
-class Exit(Exception):
-    pass
+def render_chart(
+    config_files: list[Path],
+    /,
+    compact: bool = False,
+    html: bool = False,
+    notes_per_page: int | None = None,
+    page_size: tuple[int, int] | None = None,
+    output: Path | None = None,
+    low: str | None = None,
+    high: str | None = None,
+    instrument: str | None = None,
+    using: tuple[str, ...] = (),
+) -> None:
+    """Render a fingering chart as SVG.
+
+    With --html, render an HTML page with one fingering diagram and a menu of
+    notes instead.
+
+    With --notes-per-page or --page-size WIDTH HEIGHT, split the chart into
+    pages, written to `output` with a page number added: `chart.svg` becomes
+    `chart-1.svg`, `chart-2.svg` and so on.
+
+    --low, --high and --using select some of the notes, and only those are
+    read: see `FingeringSystem.select`.
+    """
+    selecting = bool(low or high or instrument or using)
+    fs, layout = load_system(config_files, lazy=selecting)
+    msg = f'Found {len(fs.buttons)} buttons and {len(fs.note_keys)} fingerings'
+    print(msg, file=sys.stderr)
+    if layout is None:
+        return
 
+    fingerings: Mapping[Any, Fingering] = fs.fingerings
+    if selecting:
+        try:
+            notes = [_note(n) for n in (low, high)]
+            selected = fs.select(*notes, instrument, using)
+        except ErrorMakerException as e:
+            raise Exit(str(e).strip()) from None
+        if not selected:
+            raise Exit('No notes selected')
+        fingerings = {k: v[0] for k, v in selected.items()}
+
+    if notes_per_page or page_size:
+        if output is None:
+            raise Exit('Paged charts need --output')
+        output.parent.mkdir(parents=True, exist_ok=True)
+        size = page_size and Size(*page_size)
+        paged = pages(layout, fingerings, notes_per_page, size, compact)
+        try:
+            for i, page in enumerate(paged, 1):
+                path = output.with_stem(f'{output.stem}-{i}')
+                path.write_text(page + '\n')
+                print('Wrote', path, file=sys.stderr)
+        except ValueError as e:
+            raise Exit(*e.args) from None
+        return
 
-def render_chart(config_files: list[Path], /) -> None:
+    if html:
+        text = render_html(fs, layout, fingerings)
+    else:
+        text = render_svg(fs, layout, compact, fingerings)
+    if output is None:
+        print(text)
+    else:
+        output.write_text(text + '\n')
+
+
+def render_svg(
+    fs: FingeringSystem,
+    layout: Layout,
+    compact: bool = False,
+    fingerings: Mapping[Any, Fingering] | None = None,
+) -> str:
+    fingerings = fs.fingerings if fingerings is None else fingerings
+    svg = Renderer(layout, fingerings, compact=compact)()
+    return xml_to_str(svg, indent=not compact)
+
+
+def render_html(
+    fs: FingeringSystem,
+    layout: Layout,
+    fingerings: Mapping[Any, Fingering] | None = None,
+) -> str:
+    title = fs.metadata.get('name') or 'Fingering chart'
+    fingerings = fs.fingerings if fingerings is None else fingerings
+    return InteractiveRenderer(layout, fingerings, title)()
+
+
+def load_system(
+    config_files: list[Path], lazy: bool = False
+) -> tuple[FingeringSystem, Layout | None]:
     fingering, *layouts = _get_configs(config_files)
 
-    fs = fingering_system.make(fingering)
-    msg = f'Found {len(fs.buttons)} buttons and {len(fs.fingerings)} fingerings'
-    print(msg, file=sys.stderr)
+    fs = fingering_system.make(fingering, lazy=lazy)
     if not layouts:
-        return
+        return fs, None
 
     lo = layouts[0]
     styles = lo['layout'].setdefault('styles', {})
     for s in layouts[1:]:
         styles.update(s['layout'].get('styles', {}))
 
-    layout = Layout.make(lo, fs.to_button)
-    svg = Renderer(layout, fs.fingerings)()
-    print(xml_to_str(svg))
+    return fs, Layout.make(lo, fs.to_button)
+
+
+def _note(name: str | None) -> Note | None:
+    try:
+        return None if name is None else Note(name)
+    except Exception:
+        raise Exit(f'Bad note: {name}') from None
 
 
 def _get_configs(config_files: list[Path]) -> list[Any]:
@@ -1,18 +1,21 @@
 from __future__ import annotations
 
+import copy
 import dataclasses as dc
-from collections.abc import Sequence
+import re
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from typing import Any
 from xml.etree.ElementTree import Element, SubElement
 
-from .fingering_system import Button, Fingerings
+from .cached import compute_all
+from .fingering_system import Button, Fingering
 from .layout import Inset, Layout
-from .note import Note
 from .sizes import SizedRegion, Sizes
 
 NOTE_WIDTH = len('C#/D-1')
-_SVG = {'xmlns': 'http://www.w3.org/2000/svg'}
+SVG_NS = {'xmlns': 'http://www.w3.org/2000/svg'}
 
 DEFAULT_STYLES = {
     f'{k}_background': {'fill': 'transparent'}
@@ -24,7 +27,17 @@ DEFAULT_STYLES = {
 @dc.dataclass(frozen=True)
 class Renderer:
     layout: Layout
-    fingerings: Fingerings
+    fingerings: Mapping[Any, Fingering]  # Labelled with the str() of each key
+
+    # Compact mode shares identical fingerings as <symbol>s, leaves out
+    # transparent backgrounds, shortens class names and numbers, and drops
+    # whitespace: use it with `xml_to_str(svg, indent=False)`
+    compact: bool = False
+
+    # The number of threads that render note fingerings: None lets
+    # ThreadPoolExecutor choose, min(32, CPUs + 4). Using more than one
+    # freezes the renderer first
+    jobs: int | None = 1
 
     @cached_property
     def columns(self) -> int:
@@ -40,41 +53,81 @@ class Renderer:
     def rows(self) -> int:
         return self.layout.rows
 
+    @cached_property
+    def styles(self) -> dict[str, dict[str, Any]]:
+        styles = DEFAULT_STYLES | self.layout.styles
+        if self.compact:
+            styles = {k: v for k, v in styles.items() if DEFAULT_STYLES.get(k) != v}
+        return styles
+
+    @cached_property
+    def class_names(self) -> dict[str, str]:
+        return {k: _short_name(i) for i, k in enumerate(self.styles)}
+
+    @cached_property
+    def symbols(self) -> dict[tuple[Any, ...], Element]:
+        symbols: dict[tuple[Any, ...], Element] = {}
+        for fingering in self.fingerings.values():
+            uses = self._render_pieces(fingering)
+            if (key := _symbol_key(uses)) not in symbols:
+                symbols[key] = Element('symbol', id=f'f{len(symbols)}')
+                symbols[key].extend(uses)
+        return symbols
+
     @cached_property
     def svg(self) -> Element:
         s = self.sizes.document
-        svg = Element('svg', {'viewBox': f'0 0 {s.width} {s.height}'} | _SVG)
-        _add(svg, 'defs').extend(self.layout.defs)
+        svg = Element('svg', {'viewBox': f'0 0 {s.width} {s.height}'} | SVG_NS)
+        defs = add_element(svg, 'defs')
+        defs.extend(copy.deepcopy(self.layout.defs))
+        if self.compact:
+            defs.extend(self.symbols.values())
 
         def render_style(name: str, d: dict[str, Any]) -> str:
             parts = ' '.join(f'{k}: {v};' for k, v in d.items())
             return f'  .{name} {{ {parts} }}'
 
-        styles = DEFAULT_STYLES | self.layout.styles
-        styles = '\n  '.join(render_style(k, v) for k, v in styles.items())
-
-        _add(svg, 'style').text = '\n  ' + styles + '\n  '
+        styles = '\n  '.join(render_style(k, v) for k, v in self.styles.items())
+        add_element(svg, 'style').text = '\n  ' + styles + '\n  '
         return svg
 
-    @cached_property
-    def body(self) -> Element:
-        return self._add_svg(self.svg, 'body')
-
     @cached_property
     def sizes(self) -> Sizes:
         return Sizes(self.layout, self.columns, self.rows)
 
+    def freeze(self) -> Renderer:
+        """Compute everything now, so the renderer can be shared between threads"""
+        self.layout.freeze()
+        compute_all(self.sizes)
+        compute_all(self, () if self.compact else ('symbols',))
+        return self
+
     def __call__(self) -> Element:
-        self.body.append(self.layout.title)
+        """Render a new chart: calling this never changes the renderer"""
+        items = list(self.fingerings.items())
+        columns = [i % self.columns for i in range(len(items))]
+        notes = [k for k, _ in items]
+        fingerings = [v for _, v in items]
+        if self.jobs == 1:
+            figures = list(map(self._note_fingering, columns, notes, fingerings))
+        else:
+            self.freeze()
+            with ThreadPoolExecutor(self.jobs) as executor:
+                figures = list(
+                    executor.map(self._note_fingering, columns, notes, fingerings)
+                )
+
+        svg = copy.deepcopy(self.svg)
+        body = self._add_svg(svg, 'body')
+        body.append(copy.deepcopy(self.layout.title))
 
-        fingerings = list(self.fingerings.items())
         height = self.sizes.chart.height + self.layout.fingering_pad
         for row in range(self.rows):
             y = self.layout.title_height + row * height
-            chart = self._add_svg(self.body, 'chart', y=y)
+            chart = self._add_svg(body, 'chart', y=y)
             if row:
-                _add(
-                    self.body,
+                add_element(
+                    body,
                     'rect',
                     'large-separator',
                     x=self.layout.rule_x,
@@ -82,42 +135,125 @@ class Renderer:
                     width=self.sizes.body.width - 2 * self.layout.rule_x,
                     height=3,
                 )
-            row_items = fingerings[row * self.columns : (row + 1) * self.columns]
-            for column, (note, fingering) in enumerate(row_items):
-                self._note_fingering(chart, column, note, fingering)
+            chart.extend(figures[row * self.columns : (row + 1) * self.columns])
 
-        self.body.append(self.layout.footer)
-        return self.svg
+        body.append(copy.deepcopy(self.layout.footer))
+        return self._compact(svg) if self.compact else svg
 
     def _note_fingering(
-        self, chart: Element, column: int, note: Note, fingering: Sequence[Button]
-    ) -> None:
+        self, column: int, note: Any, fingering: Sequence[Button]
+    ) -> Element:
         dx, dy = self.inset.note_fingering
         x = self.sizes.note_fingering.width * column + dx + self.layout.caption_width
-        note_fingering = self._add_svg(chart, 'note_fingering', x=x)
+        note_fingering = self._add_svg(None, 'note_fingering', x=x)
         fingering_ = self._add_svg(
             note_fingering, 'fingering', y=self.layout.note_label.height
         )
-        for p in self.layout.pieces:
-            fingering_.extend(p.render(fingering))
+        if self.compact:
+            symbol = self.symbols[_symbol_key(self._render_pieces(fingering))]
+            add_element(fingering_, 'use', href=f'#{symbol.get("id")}')
+        else:
+            fingering_.extend(self._render_pieces(fingering))
 
         note_label = dc.asdict(self.layout.note_label)
-        text = _add(note_fingering, 'text', 'note_label', **note_label)
+        text = add_element(note_fingering, 'text', 'note_label', **note_label)
         text.text = str(note).center(NOTE_WIDTH)
+        return note_fingering
 
-    def _add_svg(self, parent: Element, class_: str, **kwargs: Any) -> Element:
+    def _render_pieces(self, fingering: Sequence[Button]) -> list[Element]:
+        return [e for p in self.layout.pieces for e in p.render(fingering)]
+
+    def _add_svg(self, parent: Element | None, class_: str, **kwargs: Any) -> Element:
         if size := getattr(self.sizes, class_, None):
             x, y = getattr(self.inset, class_)
             if class_ == 'chart':
                 y += self.layout.title_height
             kwargs = {'x': x, 'y': y} | size.asdict() | kwargs
 
-        r = _add(parent, 'svg', class_, **kwargs)
-        _add(r, 'rect', class_ + '_background', width='100%', height='100%')
+        r = add_element(parent, 'svg', class_, **kwargs)
+        if (background := class_ + '_background') in self.styles:
+            add_element(r, 'rect', background, width='100%', height='100%')
         return r
 
+    def _compact(self, svg: Element) -> Element:
+        names = self.class_names
+        if (style_element := svg.find('style')) is not None:
+            style_element.text = render_styles(self.styles, names, _short_number)
+
+        def compact(e: Element, in_text: bool) -> None:
+            e.tail = _compact_text(e.tail, in_text)
+            in_text = in_text or e.tag == 'text'
+            e.text = _compact_text(e.text, in_text and (e.tag != 'text' or len(e) > 0))
 
-def _add(parent: Element, tag: str, *classes: str, **kwargs: Any) -> Element:
+            if classes := e.attrib.pop('class', None):
+                if short := [names[c] for c in classes.split() if c in names]:
+                    e.set('class', ' '.join(short))
+            for k, v in list(e.attrib.items()):
+                e.set(k, ' '.join(v.split()) if k == 'd' else _short_number(v))
+
+            for child in e:
+                compact(child, in_text)
+
+        compact(svg, False)
+        return svg
+
+
+def add_element(
+    parent: Element | None, tag: str, *classes: str, **kwargs: Any
+) -> Element:
+    """Add a child to `parent`, or make a new element if `parent` is None"""
     if classes:
         kwargs = {'class': ' '.join(classes)} | kwargs
-    return SubElement(parent, tag, {k: str(v) for k, v in kwargs.items()})
+    attrib = {k: str(v) for k, v in kwargs.items()}
+    return Element(tag, attrib) if parent is None else SubElement(parent, tag, attrib)
+
+
+def render_styles(
+    styles: Mapping[str, Mapping[str, Any]],
+    names: Mapping[str, str] | None = None,
+    value: Callable[[Any], str] = str,
+) -> str:
+    """Write `styles` as CSS classes, without whitespace.
+
+    Each class is renamed by `names` if given, and each value is written
+    by `value`.
+    """
+    names = names or {}
+    return ''.join(
+        f'.{names.get(k, k)}{{{";".join(f"{p}:{value(v)}" for p, v in d.items())}}}'
+        for k, d in styles.items()
+    )
+
+
+def _short_name(i: int) -> str:
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    name = ''
+    while True:
+        i, r = divmod(i, len(letters))
+        name = letters[r] + name
+        if not i:
+            return name
+
+
+def _short_number(s: Any) -> str:
+    if not _NUMBER.fullmatch(s := str(s)):
+        return s
+    if (f := float(s)).is_integer():
+        return str(int(f))
+    return re.sub(r'^(-?)0\.', r'\1.', repr(f))
+
+
+def _compact_text(s: str | None, in_text: bool) -> str | None:
+    # Whitespace is only significant inside <text>, and even there, runs collapse
+    if not s or not in_text:
+        return (s and s.strip()) or None
+    before = ' ' if s[0].isspace() else ''
+    after = ' ' if s[-1].isspace() and not s.isspace() else ''
+    return before + ' '.join(s.split()) + after
+
+
+def _symbol_key(uses: list[Element]) -> tuple[Any, ...]:
+    return tuple(tuple(sorted(u.attrib.items())) for u in uses)
+
+
+_NUMBER = re.compile(r'-?(\d+\.?\d*|\.\d+)')
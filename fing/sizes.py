@@ -67,6 +67,11 @@ class Sizes:
         return Size(w + 2 * dw, h + 2 * dh)
 
 
+def fingering_size(layout: Layout) -> Size:
+    """The size of a single fingering diagram, with its inset"""
+    return Sizes(layout, 1, 1)._size('fingering')
+
+
 _REGIONS = {s.name for s in SizedRegion}
 _PROPERTIES = {k for k, v in vars(Sizes).items() if isinstance(v, cached_property)}
 assert _REGIONS | {'inset'} == _PROPERTIES, (_REGIONS, _PROPERTIES)
@@ -0,0 +1,118 @@
+"""
+Export a sprite sheet and one small SVG fragment per fingering, for apps that
+show one fingering at a time.
+
+The sprite sheet holds the layout's defs and styles, and must be inlined once
+into the page that shows the fragments, since each fragment only has <use>
+elements that refer to the sprites by id.
+
+Fragments are named by the hash of their contents, so notes with the same
+fingering share a file, and unchanged fragments are not rewritten. The manifest
+maps each note to the fragments of its fingerings, main fingering first.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import hashlib
+import json
+import sys
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+from xml.etree import ElementTree as ET
+from xml.etree.ElementTree import Element
+
+from .exit import Exit
+from .fingering_system import Button, Fingering
+from .layout import Layout
+from .render_chart import load_system
+from .renderer import SVG_NS, add_element, render_styles
+from .sizes import fingering_size
+
+SPRITE = 'sprite.svg'
+MANIFEST = 'manifest.json'
+HASH_LENGTH = 12
+
+
+@dc.dataclass(frozen=True)
+class SpriteSheet:
+    layout: Layout
+    alternates: Mapping[Any, list[Fingering]]  # Labelled with the str() of each key
+
+    @cached_property
+    def sprite(self) -> str:
+        svg = Element('svg', {'width': '0', 'height': '0'} | SVG_NS)
+        add_element(svg, 'defs').extend(self.layout.defs)
+        add_element(svg, 'style').text = render_styles(self.layout.styles)
+        return ET.tostring(svg, encoding='unicode')
+
+    @cached_property
+    def rendered(self) -> dict[tuple[Button, ...], str]:
+        """Each distinct fingering, rendered once"""
+        rendered = {}
+        for fingerings in self.alternates.values():
+            for f in fingerings:
+                if (key := tuple(f)) not in rendered:
+                    rendered[key] = self._render(f)
+        return rendered
+
+    @cached_property
+    def fragments(self) -> dict[str, list[str]]:
+        """For each note, the name of each of its fragments"""
+        return {
+            str(k): [_name(self.rendered[tuple(f)]) for f in v]
+            for k, v in self.alternates.items()
+        }
+
+    @cached_property
+    def contents(self) -> dict[str, str]:
+        """The contents of each distinct fragment, by name"""
+        return {_name(v): v for v in self.rendered.values()}
+
+    @cached_property
+    def manifest(self) -> dict[str, Any]:
+        return {'sprite': SPRITE, 'notes': self.fragments}
+
+    def write(self, directory: Path, jobs: int | None = None) -> list[str]:
+        """Write everything to `directory`, and return the fragments written"""
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / SPRITE).write_text(self.sprite)
+
+        new = [k for k in self.contents if not (directory / k).exists()]
+        with ThreadPoolExecutor(jobs) as executor:
+            paths = [directory / k for k in new]
+            list(executor.map(Path.write_text, paths, (self.contents[k] for k in new)))
+
+        manifest = json.dumps(self.manifest, indent=2, ensure_ascii=False)
+        (directory / MANIFEST).write_text(manifest + '\n')
+        return new
+
+    def _render(self, fingering: Fingering) -> str:
+        w, h = fingering_size(self.layout)
+        x, y = self.layout.inset.fingering
+        svg = Element('svg', {'viewBox': f'0 0 {w} {h}'} | SVG_NS)
+        inner = add_element(svg, 'svg', x=x, y=y)
+        inner.extend(e for p in self.layout.pieces for e in p.render(fingering))
+        return ET.tostring(svg, encoding='unicode')
+
+
+def _name(fragment: str) -> str:
+    digest = hashlib.sha256(fragment.encode()).hexdigest()
+    return f'{digest[:HASH_LENGTH]}.svg'
+
+
+def sprites(
+    config_files: list[Path], /, output: Path = Path('sprites'), jobs: int | None = None
+) -> None:
+    """Write a sprite sheet, a fragment for each fingering, and a JSON manifest"""
+    fs, layout = load_system(config_files)
+    if layout is None:
+        raise Exit('No layout file')
+
+    sheet = SpriteSheet(layout, fs.alternates)
+    written = sheet.write(output, jobs)
+    count = len(sheet.contents)
+    print(f'{count} fragment(s), {len(written)} new, in {output}', file=sys.stderr)
@@ -0,0 +1,323 @@
+"""
+Import and export fingerings as CSV or JSON lines, with one fingering per row.
+
+A CSV file starts with a header, either `note,fingering`, where the fingering
+is a list of buttons separated by spaces, or `note` followed by one column for
+each button, where a cell of `1`, `x`, `y`, `yes` or `true` means it is pressed.
+
+Each JSON line is an object like `{"note": "C1", "fingering": "lt l1 l2"}`,
+where the fingering can also be a list of buttons.
+
+Rows are streamed: only the fingerings of the current note are kept, so the
+alternate fingerings of a note must be on consecutive rows.
+"""
+
+from __future__ import annotations
+
+import csv
+import dataclasses as dc
+import json
+import re
+import sys
+import tomllib
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack
+from functools import cached_property
+from pathlib import Path
+from typing import IO, Literal, NamedTuple
+
+from . import fingering_system
+from .columns import Columns, literal, note_key
+from .error_maker import ErrorMaker
+from .exit import Exit
+from .fingering_system import Fingering, FingeringSystem
+from .note import Note
+
+Format = Literal['csv', 'jsonl']
+
+SUFFIXES: dict[str, Format] = {
+    '.csv': 'csv',
+    '.json': 'jsonl',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+PRESSED = {'1', 'x', 'yes', 'y', 'true'}
+_HEADER = '[fingerings]'
+_COMMENT = r'\s*(#.*)?$'
+_FINGERINGS = re.compile(
+    r'\s*\[\s*(fingerings|"fingerings"|\'fingerings\')\s*\]' + _COMMENT
+)
+_TABLE = re.compile(r'\s*\[\[?\s*[\w"\'.\- ]+\]\]?' + _COMMENT)
+_BLANK = re.compile(_COMMENT)
+
+
+class Row(NamedTuple):
+    line: int
+    note: str
+    fingering: str
+    error: str = ''  # If the row itself couldn't be read
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Row]:
+    reader = csv.reader(lines)
+    if not (header := [h.strip() for h in next(reader, [])]):
+        return
+    if header[0] != 'note':
+        yield Row(reader.line_num, '', '', 'The first column must be `note`')
+        return
+
+    buttons = None if header[1:] == ['fingering'] else header[1:]
+    for cells in reader:
+        line = reader.line_num
+        if not any(c.strip() for c in cells):
+            continue
+        if len(cells) != len(header):
+            yield Row(line, '', '', f'Expected {len(header)} cells, got {len(cells)}')
+        elif buttons is None:
+            yield Row(line, cells[0].strip(), cells[1])
+        else:
+            pressed = (b for b, c in zip(buttons, cells[1:]) if _pressed(c))
+            yield Row(line, cells[0].strip(), ' '.join(pressed))
+
+
+def read_jsonl(lines: Iterable[str]) -> Iterator[Row]:
+    for i, line in enumerate(lines):
+        if not (line := line.strip()):
+            continue
+        try:
+            d = json.loads(line)
+            note, fingering = d['note'], d['fingering']
+        except (ValueError, TypeError, KeyError) as e:
+            yield Row(i + 1, '', '', f'Bad JSON line: {e}')
+            continue
+        if isinstance(fingering, list) and all(isinstance(f, str) for f in fingering):
+            fingering = ' '.join(fingering)
+        if not isinstance(fingering, str):
+            yield Row(i + 1, '', '', f'Bad fingering: {json.dumps(fingering)}')
+            continue
+        yield Row(i + 1, str(note), fingering)
+
+
+READERS: dict[Format, Callable[[Iterable[str]], Iterator[Row]]] = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+}
+
+
+def _print_error(s: str) -> None:
+    print(s, file=sys.stderr)
+
+
+@dc.dataclass(frozen=True)
+class Importer:
+    fs: FingeringSystem
+    on_error: Callable[[str], None] = _print_error
+
+    counts: Counter[str] = dc.field(default_factory=Counter)
+
+    @cached_property
+    def columns(self) -> Columns:
+        """The layout of the system's own fingerings table, if it has one"""
+        values = self.fs.fingerings_.values()
+        strings = (s for v in values for s in ([v] if isinstance(v, str) else v))
+        return Columns.detect(self.fs.all, strings) or Columns.make(self.fs.all)
+
+    def __call__(
+        self, rows: Iterable[Row], source: str = '', header: bool = True
+    ) -> Iterator[str]:
+        """Yield the lines of a TOML fingerings table made from the rows"""
+        if header:
+            yield _HEADER
+        all_ = self.fs.fingerings_.get('all')
+        if not isinstance(all_, str):
+            all_ = ' '.join(b.short_name for b in self.fs.all)
+        yield f'all = {literal(all_).as_string()}'
+        yield ''
+
+        seen: set[Note] = set()
+        note: Note | None = None
+        group: list[Fingering] = []
+
+        for row in rows:
+            self.counts['rows'] += 1
+            if (fingering := self._parse(row, source)) is None:
+                continue
+
+            n, buttons = fingering
+            if note is None or n != note:
+                if n in seen:
+                    self._error(row, source, f'{n} is not on consecutive rows')
+                    continue
+                if note is not None:
+                    yield self._line(note, group)
+                seen.add(n)
+                note, group = n, []
+
+            if any(set(buttons) == set(f) for f in group):
+                self._error(row, source, 'Duplicate fingering')
+                continue
+            group.append(sorted(buttons, key=self.fs.bits.__getitem__))
+
+        if note is not None:
+            yield self._line(note, group)
+
+    def _parse(self, row: Row, source: str) -> tuple[Note, Fingering] | None:
+        if row.error:
+            self._error(row, source, row.error)
+            return None
+        if row.note == 'all':
+            self._error(row, source, '`all` comes from the fingering system')
+            return None
+
+        err = ErrorMaker(reraise=False)
+        parsed = self.fs.parse_fingering(row.note, row.fingering, err)
+        if parsed and (bad := [b.name for b in parsed[1] if b not in self.fs.bits]):
+            err('Not in `all`', row.note, bad)
+        if err.errors:
+            msgs = (f'{k}: {", ".join(v)}' for k, v in err.errors.items())
+            self._error(row, source, '; '.join(msgs))
+            return None
+
+        assert parsed and parsed[0] is not None
+        return parsed[0], parsed[1]
+
+    def _error(self, row: Row, source: str, msg: str) -> None:
+        self.counts['errors'] += 1
+        self.on_error(f'{source}:{row.line}: {msg}')
+
+    def _line(self, note: Note, group: list[Fingering]) -> str:
+        self.counts['fingerings'] += len(group)
+        self.counts['notes'] += 1
+        return f'{note_key(note.note_number)} = {self._value(group)}'
+
+    def _value(self, group: list[Fingering]) -> str:
+        strings = [
+            literal(self.columns.format([b.short_name for b in f])).as_string()
+            for f in group
+        ]
+        return strings[0] if len(strings) == 1 else f'[{", ".join(strings)}]'
+
+
+def write_csv(fs: FingeringSystem, fp: IO[str]) -> None:
+    writer = csv.writer(fp, lineterminator='\n')
+    writer.writerow(('note', 'fingering'))
+    writer.writerows(_rows(fs))
+
+
+def write_jsonl(fs: FingeringSystem, fp: IO[str]) -> None:
+    for note, fingering in _rows(fs):
+        fp.write(json.dumps({'note': note, 'fingering': fingering}) + '\n')
+
+
+WRITERS: dict[Format, Callable[[FingeringSystem, IO[str]], None]] = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+}
+
+
+def import_fingerings(
+    system: Path,
+    rows: Path,
+    /,
+    output: Path | None = None,
+    format: Format | None = None,
+) -> None:
+    """Replace the fingerings of a system with ones read from CSV or JSON lines.
+
+    Everything but the fingerings comes from the `system` file. Rows named `-`
+    are read from stdin. Bad rows are reported and skipped. The result is only
+    written if it parses.
+    """
+    text, fs = _load(system)
+    format = format or _format(rows)
+    head, tail = split_system(text)
+    newline = '\r\n' if head.endswith('\r\n') else '\n'
+
+    importer = Importer(fs)
+    with ExitStack() as stack:
+        if str(rows) == '-':
+            source, lines = '<stdin>', sys.stdin
+        else:
+            source, lines = str(rows), stack.enter_context(rows.open(newline=''))
+        table = importer(READERS[format](lines), source, header=False)
+        result = head + ''.join(line + newline for line in table) + tail
+
+    c = importer.counts
+    msg = f'Read {c["rows"]} rows: {c["fingerings"]} fingerings for {c["notes"]} notes'
+    print(msg, file=sys.stderr)
+    try:
+        tomllib.loads(result)
+    except tomllib.TOMLDecodeError as e:
+        raise Exit(f'The imported system would not parse: {e}') from None
+
+    if output is None:
+        sys.stdout.write(result)
+    else:
+        with output.open('w', newline='') as fp:
+            fp.write(result)
+    if c['errors']:
+        raise Exit(f'{c["errors"]} bad row(s)')
+
+
+def export_fingerings(
+    system: Path,
+    /,
+    output: Path | None = None,
+    format: Format | None = None,
+) -> None:
+    """Write the fingerings of a system as CSV or JSON lines, one per row"""
+    _, fs = _load(system)
+    if format is None:
+        format = 'csv' if output is None else _format(output)
+
+    if output is None:
+        WRITERS[format](fs, sys.stdout)
+    else:
+        with output.open('w', newline='') as fp:
+            WRITERS[format](fs, fp)
+
+
+def split_system(text: str) -> tuple[str, str]:
+    """Split a system's TOML around the rows of its fingerings table.
+
+    The head ends with the table's header line, and the tail starts with the
+    comments and blank lines after the last row, if any.
+    """
+    lines = text.splitlines(keepends=True)
+    start = next((i for i, s in enumerate(lines) if _FINGERINGS.match(s)), None)
+    if start is None:
+        raise Exit('No [fingerings] table')
+
+    end = start + 1
+    while end < len(lines) and not _TABLE.match(lines[end]):
+        end += 1
+    while end > start + 1 and _BLANK.match(lines[end - 1]):
+        end -= 1
+    return ''.join(lines[: start + 1]), ''.join(lines[end:])
+
+
+def _rows(fs: FingeringSystem) -> Iterator[tuple[str, str]]:
+    for note, fingerings in fs.alternates.items():
+        for f in fingerings:
+            yield note_key(note.note_number), ' '.join(b.short_name for b in f)
+
+
+def _load(system: Path) -> tuple[str, FingeringSystem]:
+    try:
+        with system.open(newline='') as fp:
+            text = fp.read()
+        fs = fingering_system.make(tomllib.loads(text))  # ty: ignore[invalid-argument-type]
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise Exit(f'{system}: {e}') from None
+    return text, fs
+
+
+def _format(path: Path) -> Format:
+    if format := SUFFIXES.get(path.suffix.lower()):
+        return format
+    raise Exit(f'{path}: Unknown format: use --format')
+
+
+def _pressed(cell: str) -> bool:
+    return cell.strip().lower() in PRESSED
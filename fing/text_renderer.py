@@ -0,0 +1,120 @@
+"""
+Render fingerings as lines of text, one note per line, for terminals and pipes.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import os
+import sys
+import tomllib
+from collections.abc import Iterable, Iterator, Mapping
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from . import fingering_system
+from .exit import Exit
+from .fingering_system import Button, Fingering, FingeringSystem
+from .note import Note
+
+PRESSED = '●'
+PARTLY_PRESSED = '◐'
+OFF = '○'
+NOTE_WIDTH = len('C♯/D♭1') + 2
+
+
+@dc.dataclass(frozen=True)
+class TextRenderer:
+    fs: FingeringSystem
+
+    # Glyphs for buttons, by name or short_name. By default, a button is
+    # PRESSED if it's the only one for its press or is named after it, and
+    # otherwise PARTLY_PRESSED
+    glyphs: Mapping[str, str] = dc.field(default_factory=dict)
+    off: str = OFF
+
+    @cached_property
+    def columns(self) -> list[list[Button]]:
+        """One column for each press, in the order of `all`"""
+        columns: dict[str, list[Button]] = {}
+        for b in self.fs.all:
+            columns.setdefault(b.press, []).append(b)
+        return list(columns.values())
+
+    @cached_property
+    def button_glyphs(self) -> dict[Button, str]:
+        glyphs = {}
+        for column in self.columns:
+            for b in column:
+                if not (g := self.glyphs.get(b.name) or self.glyphs.get(b.short_name)):
+                    full = len(column) == 1 or b.name == b.press
+                    g = PRESSED if full else PARTLY_PRESSED
+                glyphs[b] = g
+        return glyphs
+
+    @cached_property
+    def groups(self) -> list[int]:
+        """The number of columns in each group, like a hand, separated by spaces"""
+        hands = [c[0].press.partition('-')[0] for c in self.columns]
+        groups = [1]
+        for previous, hand in zip(hands, hands[1:]):
+            if previous == hand:
+                groups[-1] += 1
+            else:
+                groups.append(1)
+        return groups
+
+    def row(self, note: Any, fingering: Fingering) -> str:
+        cells = []
+        for column in self.columns:
+            pressed = (b for b in column if b in fingering)
+            cells.append(next((self.button_glyphs[b] for b in pressed), self.off))
+
+        parts, start = [], 0
+        for g in self.groups:
+            parts.append(''.join(cells[start : start + g]))
+            start += g
+        return f'{note!s:<{NOTE_WIDTH}}{" ".join(parts)}'
+
+    def __call__(self, notes: Iterable[Note] | None = None) -> Iterator[str]:
+        """Yield one line for each fingering of each note, including alternates"""
+        if notes is None:
+            notes = self.fs.note_keys
+        for note in notes:
+            for fingering in self.fs.fingerings_for(note):
+                yield self.row(note, fingering)
+
+
+def show(notes: list[str], /, system: Path | None = None) -> None:
+    """Print the fingerings for some notes, or for every note.
+
+    The fingering file is `system`, or else the environment variable FING_SYSTEM.
+    """
+    if system is None:
+        if not (env := os.environ.get('FING_SYSTEM')):
+            raise Exit('No fingering system: use --system or set FING_SYSTEM')
+        system = Path(env)
+
+    try:
+        with system.open('rb') as fp:
+            doc = tomllib.load(fp)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise Exit(f'{system}: {e}') from None
+
+    # Only the fingerings of the notes asked for are read
+    fs = fingering_system.make(doc, lazy=bool(notes))  # ty: ignore[invalid-argument-type]
+    renderer = TextRenderer(fs)
+    selected = [_note(n) for n in notes] if notes else None
+    for line in renderer(selected):
+        print(line)
+
+    if missing := [n for n in selected or () if not fs.fingerings_for(n)]:
+        print('No fingering for:', *missing, file=sys.stderr)
+
+
+def _note(name: str) -> Note:
+    try:
+        return Note(name)
+    except Exception:
+        raise Exit(f'Bad note: {name}') from None
@@ -0,0 +1,163 @@
+"""
+Report the costs of moving between every pair of fingerings of a system.
+
+The costs come from `FingeringMatrix.transition_costs`, computed in one pass
+with numpy. Here they are summed up per note, where the cost between two notes
+is that of their easiest pair of fingerings, written as CSV, or drawn as a
+heatmap.
+"""
+
+from __future__ import annotations
+
+import csv
+from collections.abc import Sequence
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, NamedTuple
+from xml.etree.ElementTree import Element
+
+from .exit import Exit
+from .note import Note
+from .render_chart import load_system
+from .renderer import SVG_NS, add_element, render_styles
+from .sizes import Size
+from .xml_to_str import xml_to_str
+
+if TYPE_CHECKING:
+    from .matrix import FingeringMatrix
+
+CELL = Size(16, 16)
+LABEL_WIDTH = 100
+LEVELS = 10
+
+STYLES = {
+    'label': {'font-size': '11px', 'font-family': 'monospace'},
+    **{f'h{i}': {'fill': f'hsl(10, 85%, {96 - 7 * i}%)'} for i in range(LEVELS)},
+}
+
+
+class Difficulty(NamedTuple):
+    mean: float  # Over all pairs of different fingerings
+    step_mean: float  # Over each pair of neighboring notes, using the best fingerings
+    step_max: float
+    hardest: list[tuple[Note, Note, float]]  # The costliest neighboring steps
+
+    def __str__(self) -> str:
+        lines = [
+            f'Mean cost:      {self.mean:.2f}',
+            f'Mean step cost: {self.step_mean:.2f}',
+            f'Max step cost:  {self.step_max:.2f}',
+        ]
+        lines += (f'  {a!s:8}{b!s:8}{c:g}' for a, b, c in self.hardest)
+        return '\n'.join(lines)
+
+
+def labels(m: FingeringMatrix) -> list[str]:
+    """A label for each fingering, with a number for alternates"""
+    return [
+        str(Note.from_number(int(n))) + (f' ({a + 1})' if a else '')
+        for n, a in zip(m.note_numbers, m.alternates)
+    ]
+
+
+def note_costs(m: FingeringMatrix, costs: Any) -> tuple[list[Note], list[list[float]]]:
+    """The cost between each pair of notes, using their easiest fingerings"""
+    rows: dict[int, list[int]] = {}
+    for i, n in enumerate(m.note_numbers):
+        rows.setdefault(int(n), []).append(i)
+
+    notes = [Note.from_number(n) for n in rows]
+    blocks = [costs[r] for r in rows.values()]
+    return notes, [[float(b[:, c].min()) for c in rows.values()] for b in blocks]
+
+
+def difficulty(m: FingeringMatrix, costs: Any, hardest: int = 5) -> Difficulty:
+    n = len(costs)
+    mean = float(costs.sum()) / (n * (n - 1)) if n > 1 else 0.0
+
+    notes, matrix = note_costs(m, costs)
+    steps = [
+        (notes[i], notes[i + 1], matrix[i][i + 1])
+        for i in range(len(notes) - 1)
+        if notes[i + 1].note_number - notes[i].note_number == 1
+    ]
+    step_costs = [c for _, _, c in steps] or [0.0]
+    worst = sorted(steps, key=lambda s: -s[2])[:hardest]
+    return Difficulty(mean, sum(step_costs) / len(step_costs), max(step_costs), worst)
+
+
+def write_csv(names: Sequence[str], matrix: Any, fp: IO[str]) -> None:
+    writer = csv.writer(fp, lineterminator='\n')
+    writer.writerow(('', *names))
+    for name, row in zip(names, matrix):
+        writer.writerow((name, *(f'{float(c):g}' for c in row)))
+
+
+def draw_heatmap(names: Sequence[str], matrix: Any) -> Element:
+    """Draw a square matrix of costs, darker where they are higher"""
+    n = len(names)
+    top = max(1.0, max((float(c) for row in matrix for c in row), default=1.0))
+    size = Size(LABEL_WIDTH + n * CELL.width, LABEL_WIDTH + n * CELL.height)
+
+    svg = Element('svg', {'viewBox': f'0 0 {size.width} {size.height}'} | SVG_NS)
+    add_element(svg, 'style').text = render_styles(STYLES)
+
+    for i, name in enumerate(names):
+        y = LABEL_WIDTH + i * CELL.height
+        x = LABEL_WIDTH + i * CELL.width
+        add_element(svg, 'text', 'label', x=2, y=y + CELL.height - 4).text = name
+        column = add_element(
+            svg, 'text', 'label', x=x + CELL.width - 4, y=LABEL_WIDTH - 2
+        )
+        column.set('transform', f'rotate(-90 {x + CELL.width - 4} {LABEL_WIDTH - 2})')
+        column.text = name
+
+    for i, row in enumerate(matrix):
+        for j, cost in enumerate(row):
+            level = min(LEVELS - 1, int(LEVELS * float(cost) / top))
+            x, y = LABEL_WIDTH + j * CELL.width, LABEL_WIDTH + i * CELL.height
+            rect = add_element(svg, 'rect', f'h{level}', x=x, y=y, **CELL._asdict())
+            add_element(
+                rect, 'title'
+            ).text = f'{names[i]} → {names[j]}: {float(cost):g}'
+    return svg
+
+
+def transitions(
+    config_files: list[Path],
+    /,
+    weights: dict[str, float] | None = None,
+    same_finger: float = 1.0,
+    csv_file: Path | None = None,
+    heatmap: Path | None = None,
+    hardest: int = 5,
+) -> None:
+    """Report how hard it is to move between the fingerings of a system.
+
+    Moving a button costs the weight of its press in `weights`, or 1, and a
+    finger that slides between buttons costs `same_finger` more.
+
+    --csv-file writes the costs between every pair of fingerings, and --heatmap
+    draws the costs between every pair of notes as SVG.
+    """
+    fs, _ = load_system(config_files)
+    try:
+        m = fs.matrix
+    except ImportError as e:
+        msg = f'{e.name} is needed to compute transitions: install fing[matrix]'
+        raise Exit(msg) from None
+
+    if bad := sorted(set(weights or ()) - set(m.presses)):
+        raise Exit(f'Unknown press: {", ".join(bad)}')
+    if weights or same_finger != 1:
+        costs = m.transition_costs(weights, same_finger)
+    else:
+        costs = m.transitions
+
+    print(difficulty(m, costs, hardest))
+    if csv_file:
+        with csv_file.open('w', newline='') as fp:
+            write_csv(labels(m), costs, fp)
+    if heatmap:
+        notes, matrix = note_costs(m, costs)
+        svg = draw_heatmap([str(n) for n in notes], matrix)
+        heatmap.write_text(xml_to_str(svg) + '\n')
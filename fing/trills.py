@@ -0,0 +1,155 @@
+"""
+Find trill and tremolo fingerings: for each pair of notes within an interval,
+the pairs of fingerings that move the fewest fingers, including alternates.
+"""
+
+from __future__ import annotations
+
+import dataclasses as dc
+import sys
+from collections.abc import Iterator, Sequence
+from functools import cached_property
+from pathlib import Path
+from typing import NamedTuple
+
+from .exit import Exit
+from .fingering_system import Button, Fingering, FingeringSystem
+from .note import Note
+from .render_chart import load_system
+from .renderer import Renderer
+from .xml_to_str import xml_to_str
+
+
+@dc.dataclass(frozen=True)
+class Trill:
+    low: Note
+    high: Note
+    low_fingering: Fingering
+    high_fingering: Fingering
+    fingers: tuple[str, ...]  # The presses that move
+
+    @property
+    def cost(self) -> int:
+        return len(self.fingers)
+
+    @cached_property
+    def lifted(self) -> list[Button]:
+        return [b for b in self.low_fingering if b not in self.high_fingering]
+
+    @cached_property
+    def pressed(self) -> list[Button]:
+        return [b for b in self.high_fingering if b not in self.low_fingering]
+
+    def __str__(self) -> str:
+        moves = [f'-{b.short_name}' for b in self.lifted]
+        moves += [f'+{b.short_name}' for b in self.pressed]
+        return f'{self.low!s:8}{self.high!s:8}{self.cost:<3}{" ".join(moves)}'
+
+
+@dc.dataclass(frozen=True)
+class TrillFinder:
+    fs: FingeringSystem
+
+    @cached_property
+    def presses(self) -> list[str]:
+        return list(dict.fromkeys(b.press for b in self.fs.all))
+
+    @cached_property
+    def finger_tables(self) -> list[list[int]]:
+        """For each byte of a button mask, a table from that byte to a press mask"""
+        press_bits = [1 << self.presses.index(b.press) for b in self.fs.all]
+        tables = []
+        for start in range(0, len(press_bits), 8):
+            bits = press_bits[start : start + 8]
+            bits += [0] * (8 - len(bits))
+            table = [0] * 256
+            for byte in range(1, 256):
+                low = byte & -byte
+                table[byte] = table[byte ^ low] | bits[low.bit_length() - 1]
+            tables.append(table)
+        return tables
+
+    @cached_property
+    def masks(self) -> dict[Note, list[tuple[int, Fingering]]]:
+        items = self.fs.alternates.items()
+        return {k: [(self.fs.mask(f), f) for f in v] for k, v in items}
+
+    def finger_mask(self, buttons: int) -> int:
+        """The presses that touch any of the buttons in a button mask"""
+        result = 0
+        for table in self.finger_tables:
+            result |= table[buttons & 0xFF]
+            buttons >>= 8
+        return result
+
+    def __call__(self, interval: int = 2) -> Iterator[Trill]:
+        """Yield the easiest trills for each pair of notes within `interval`"""
+        notes = sorted(self.masks)
+        for i, low in enumerate(notes):
+            for high in notes[i + 1 :]:
+                if high.note_number - low.note_number > interval:
+                    break
+                yield from self._best(low, high)
+
+    def _best(self, low: Note, high: Note) -> list[Trill]:
+        best: list[tuple[int, int, Fingering, Fingering]] = []
+        cost = sys.maxsize
+        for m1, f1 in self.masks[low]:
+            for m2, f2 in self.masks[high]:
+                fingers = self.finger_mask(m1 ^ m2)
+                if (c := fingers.bit_count()) <= cost:
+                    if c < cost:
+                        best.clear()
+                        cost = c
+                    best.append((fingers, m1 ^ m2, f1, f2))
+
+        # Break ties by the number of buttons that move
+        fewest = min((b[1].bit_count() for b in best), default=0)
+        return [
+            Trill(low, high, f1, f2, self._fingers(fingers))
+            for fingers, moved, f1, f2 in best
+            if moved.bit_count() == fewest
+        ]
+
+    def _fingers(self, mask: int) -> tuple[str, ...]:
+        return tuple(p for i, p in enumerate(self.presses) if mask >> i & 1)
+
+
+class _Label(NamedTuple):
+    text: str
+    index: int
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def trill_chart(trills: Sequence[Trill]) -> dict[_Label, Fingering]:
+    """Fingerings for a chart with the two halves of each trill side by side"""
+    chart: dict[_Label, Fingering] = {}
+    for t in trills:
+        chart[_Label(str(t.low), len(chart))] = t.low_fingering
+        chart[_Label(str(t.high), len(chart))] = t.high_fingering
+    return chart
+
+
+def trills(
+    config_files: list[Path],
+    /,
+    interval: int = 2,
+    max_fingers: int | None = None,
+    chart: Path | None = None,
+) -> None:
+    """Print the trills that move the fewest fingers, and optionally chart them"""
+    fs, layout = load_system(config_files)
+    found = [
+        t
+        for t in TrillFinder(fs)(interval)
+        if max_fingers is None or t.cost <= max_fingers
+    ]
+    for t in found:
+        print(t)
+
+    if chart is not None:
+        if layout is None:
+            raise Exit('A layout file is needed to render a chart')
+        chart.write_text(xml_to_str(Renderer(layout, trill_chart(found))()))
@@ -2,12 +2,14 @@ from io import StringIO
 from xml.etree import ElementTree as ET
 
 
-def xml_to_str(e: ET.Element) -> str:
-    ET.indent(e)
+def xml_to_str(e: ET.Element, indent: bool = True) -> str:
+    if indent:
+        ET.indent(e)
 
     f = StringIO()
     ET.ElementTree(e).write(f, encoding='unicode', xml_declaration=True)
-    return fix_text_indenting(f.getvalue())
+    s = f.getvalue()
+    return fix_text_indenting(s) if indent else s
 
 
 def fix_text_indenting(s: str) -> str:
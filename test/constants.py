@@ -16,6 +16,7 @@ def load(f):
 
 TEST_FINGERINGS = Path('charts/recorder-fingerings.svg')
 TEST_FINGERINGS_COLOR = Path('charts/recorder-fingerings.color.svg')
+TEST_FINGERINGS_COMPACT = Path('charts/recorder-fingerings.min.svg')
 REWRITE_TEST_DATA = os.environ.get('REWRITE_TEST_DATA')
 SIZES_FILE = Path('test/sizes.json')
 
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import constants
+import pytest
+
+from fing.build import Builder, Chart, find_charts, read_manifest
+from fing.exit import Exit
+
+
+@pytest.fixture
+def charts(tmp_path):
+    for f in constants.FS_FILE, constants.LAYOUT_FILE, constants.COLOR_FILE:
+        shutil.copy(f, tmp_path)
+    names = [f.name for f in (constants.FS_FILE, constants.LAYOUT_FILE)]
+    manifest = tmp_path / 'charts.toml'
+    manifest.write_text(
+        f"[charts.'plain.svg']\ninputs = {names}\n"
+        f"[charts.'color.svg']\ninputs = {[*names, constants.COLOR_FILE.name]}\n"
+    )
+    return tmp_path, read_manifest(manifest)
+
+
+def test_build(charts):
+    root, manifest = charts
+    plain, color = manifest
+    assert plain == Chart(
+        root / 'plain.svg',
+        (root / constants.FS_FILE.name, root / constants.LAYOUT_FILE.name),
+    )
+
+    def builder():
+        return Builder(manifest, root / '.fing-build.json')
+
+    assert builder().build(jobs=2) == [plain, color]
+    assert plain.output.read_text() == constants.TEST_FINGERINGS.read_text()
+    assert color.output.read_text() == constants.TEST_FINGERINGS_COLOR.read_text()
+    assert builder().build() == []
+    assert builder().check() == []
+
+    colors = root / constants.COLOR_FILE.name
+    colors.write_text(colors.read_text().replace('pink', 'red'))
+    assert builder().check() == [color]
+    assert builder().build() == [color]
+    assert builder().check() == []
+
+    plain.output.write_text('edited')
+    assert builder().check() == [plain]
+    assert builder().build(force=True) == [plain, color]
+
+
+def test_find_charts(tmp_path):
+    charts = find_charts(constants.ROOT.parent, tmp_path)
+    charts = [c for c in charts if c.inputs[0] == constants.FS_FILE]
+    outputs = [c.output.name for c in charts]
+    assert outputs == ['recorder-fingering.svg', 'recorder-fingering.colors.svg']
+    assert charts[1].inputs[-1] == constants.COLOR_FILE
+
+
+def test_bad_manifest(tmp_path):
+    manifest = tmp_path / 'charts.toml'
+    manifest.write_text("[charts.'a.svg']\n")
+    with pytest.raises(Exit):
+        read_manifest(manifest)
+
+
+def test_state_is_relative(charts, monkeypatch):
+    root, _ = charts
+    monkeypatch.chdir(root)
+    builder = Builder(read_manifest(Path('charts.toml')), Path('.fing-build.json'))
+    assert len(builder.build(jobs=1)) == 2
+    state = json.loads((root / '.fing-build.json').read_text())
+    assert sorted(state) == ['color.svg', 'plain.svg']
+    assert sorted(state['plain.svg']['inputs']) == [
+        constants.LAYOUT_FILE.name,
+        constants.FS_FILE.name,
+    ]
+
+    (root / 'sub').mkdir()
+    monkeypatch.chdir(root / 'sub')
+    manifest = read_manifest(Path('../charts.toml'))
+    assert Builder(manifest, Path('../.fing-build.json')).stale() == []
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import constants
+import pytest
+
+from fing.coverage import Coverage, coverage
+from fing.exit import Exit
+
+
+def test_coverage():
+    report = Coverage(constants.FS).report()
+    assert report.states == 3**3 * 2**6
+    assert report.covered == len(constants.FS.fingerings)
+    assert not report.ambiguous
+    assert str(report).splitlines()[:3] == [
+        'States:  1728',
+        'Covered: 27 (1.56%)',
+        'Dead:    1701',
+    ]
+
+
+@pytest.mark.parametrize('possible_only', (False, True))
+def test_coverage_brute_force(possible_only):
+    fs = constants.FS
+    cov = Coverage(fs, ('cb',), {'oct': 12, 'r4h': 1}, possible_only)
+    report = cov.report()
+
+    ignore = fs.mask([fs.to_button['cb']])
+    modifiers = {fs.bits[fs.to_button[k]]: v for k, v in cov.modifiers.items()}
+    table = {}
+    for note, fingering in fs.fingerings.items():
+        mask = fs.mask(fingering)
+        base = note.note_number - sum(v for k, v in modifiers.items() if k & mask)
+        table[core] = min(base, table.get(core := mask & cov.core, base))
+
+    states, notes = 0, Counter()
+    for state in range(1 << len(fs.all)):
+        buttons = [b for b in fs.all if fs.bits[b] & state]
+        if possible_only and fs.conflicts(buttons):
+            continue
+        states += 1
+        if (base := table.get(state & ~ignore & cov.core)) is not None:
+            notes[base + sum(v for k, v in modifiers.items() if k & state)] += 1
+
+    assert report.states == states
+    assert report.notes == dict(sorted(notes.items()))
+    assert len(report.ambiguous) == 3
+
+
+def test_dead_zones():
+    cov = Coverage(constants.FS)
+    dead = list(cov.dead_zones())
+    assert len(dead) == cov.report().dead
+    assert dead[0] == []
+
+
+def test_unknown_button():
+    with pytest.raises(Exit, match='Unknown button: zz, yy'):
+        coverage([constants.FS_FILE], ignore=('zz', 'cb'), modifiers={'yy': 1})
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import constants
+import pytest
+import tomlkit
+
+from fing.edit import (
+    AddButton,
+    RemoveButton,
+    RenameButton,
+    ReorderButtons,
+    RespellNote,
+    edit,
+)
+from fing.error_maker import ErrorMakerException
+from fing.note import Note
+
+
+def _edit(*edits):
+    doc = tomlkit.parse(constants.FS_FILE.read_text())
+    fs = edit(doc, edits)
+    return doc.as_string(), fs
+
+
+def test_no_edits():
+    actual, fs = _edit()
+    assert actual == constants.FS_FILE.read_text()
+    assert fs.fingerings == constants.FS.fingerings
+
+
+def test_edits():
+    actual, fs = _edit(
+        RenameButton('octave', 'th'),
+        RemoveButton('cb'),
+        AddButton('r4', notes=['C2']),
+        RespellNote('Gb2', 'Gb_2'),
+    )
+    lines = actual.splitlines()
+    assert "short_name = 'th'" in lines
+    assert "all = 'th lt l1 l2 l3 r1 r2 r3 r3h r4 r4h cb'" in lines
+    assert "C_2 = 'lt      l2                  r4      '" in lines
+    assert "Db3 = 'th  l1      l3  r1      r3          '" in lines
+    assert "Gb_2 = 'th  l1  l2  l3      r2              '" in lines
+    assert "D_1 = 'lt  l1  l2  l3  r1  r2  r3          '" in lines
+
+    assert [b.short_name for b in fs.fingerings[Note('E2')]][0] == 'th'
+    assert not any(b.short_name == 'cb' for f in fs.fingerings.values() for b in f)
+
+
+def test_invalid_edit():
+    with pytest.raises(ErrorMakerException):
+        _edit(AddButton('oct', notes=['C1']))
+
+
+def test_rename_widens_columns():
+    actual, fs = _edit(RenameButton('octave', 'octv'))
+    lines = actual.splitlines()
+    assert "C_1 = 'lt   l1   l2   l3   r1   r2   r3   r4        '" in lines
+    assert "E_2 = 'octv l1   l2   l3   r1   r2                  '" in lines
+
+    table = tomlkit.parse(actual)['fingerings']
+    widths = {len(v) for k, v in table.items() if k != 'all' and isinstance(v, str)}
+    assert widths == {len('octv ') * 9}
+
+    def names(fs):
+        return {k: [b.name for b in v] for k, v in fs.fingerings.items()}
+
+    assert names(fs) == names(constants.FS)
+
+
+def test_reorder_buttons():
+    order = ['lt', 'oct', 'l1', 'l2', 'l3', 'r1', 'r2', 'r3', 'r3h', 'r4', 'r4h', 'cb']
+    actual, fs = _edit(ReorderButtons(order))
+    lines = actual.splitlines()
+    assert "all = 'lt oct l1 l2 l3 r1 r2 r3 r3h r4 r4h cb'" in lines
+    assert "C_1 = 'lt  l1  l2  l3  r1  r2  r3  r4      '" in lines
+    assert [b.short_name for b in fs.all][:2] == ['lt', 'oct']
+
+    with pytest.raises(ErrorMakerException, match='every button'):
+        _edit(ReorderButtons(order[1:]))
+
+
+def test_respell_unaligned():
+    doc = tomlkit.parse(constants.FS_FILE.read_text())
+    table = doc['fingerings']
+    for k, v in table.items():
+        table[k] = ' '.join(v.split())
+
+    edit(doc, [RespellNote('Gb1', 'F#1')])
+    assert '"F#1" = "lt l1 l2 l3 r2 r3"' in doc.as_string().splitlines()
+    assert list(doc['fingerings'])[7] == 'F#1'
+
+
+@pytest.mark.parametrize(
+    'respell, message',
+    [
+        (RespellNote('Gb1', 'G_1'), 'changes the pitch'),
+        (RespellNote('Gb1', 'F#1'), 'quoted key'),
+        (RespellNote('Gb1', 'X1'), 'Invalid note'),
+    ],
+)
+def test_respell_errors(respell, message):
+    doc = tomlkit.parse(text := constants.FS_FILE.read_text())
+    with pytest.raises(ErrorMakerException, match=message):
+        edit(doc, [respell])
+    assert doc.as_string() == text
+
+
+def test_respell_collision():
+    doc = tomlkit.parse(constants.FS_FILE.read_text())
+    doc['fingerings']['Gb_1'] = 'lt'
+    text = doc.as_string()
+    with pytest.raises(ErrorMakerException, match='already in the table'):
+        edit(doc, [RespellNote('Gb1', 'Gb_1')])
+    assert doc.as_string() == text
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import constants
+import tomlkit
+
+from fing import fingering_system
+from fing.infer import Inference
+from fing.note import Note
+
+
+def _lines(fs):
+    for note, fingering in fs.fingerings.items():
+        yield f'{fs.mask(fingering)},{note.name}'
+        yield '+'.join(b.short_name for b in fingering) + f' {note.note_number}'
+
+
+def test_infer():
+    fs = constants.FS
+    inference = Inference(fs)
+    inference.read(_lines(fs))
+
+    alternate = 'lt l1 l2 l3 r1 r3h'
+    inference.read([f'{alternate},E1', 'lt+zz,C1', '0x3,C1', '0x3,C1', '0x3,D1'])
+
+    assert inference.error_count.total() == 1
+    assert inference.errors == [":2: Unknown button ['zz']: lt+zz,C1"]
+    assert list(inference.contradictions()) == [3]
+
+    doc = inference.document(tomlkit.parse(constants.FS_FILE.read_text()))
+    inferred = fingering_system.make(tomlkit.parse(doc.as_string()))
+    assert inferred.fingerings == fs.fingerings
+
+    e1 = inferred.alternates[Note('E1')]
+    assert len(e1) == 2
+    assert ' '.join(b.short_name for b in e1[1]) == alternate
+
+    assert '# 2 @ 1.00, 1 @ 1.00' in doc.as_string()
+
+    # Comments outside the fingerings are kept
+    original = constants.FS_FILE.read_text()
+    head, _, rest = original.partition('[fingerings]\n')
+    assert doc.as_string().startswith(head)
+    assert doc.as_string().endswith(rest[rest.index('\n\n# `lowest_c`') :])
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from xml.etree import ElementTree as ET
+
+import constants
+
+from fing.interactive import InteractiveRenderer
+
+NS = {'svg': 'http://www.w3.org/2000/svg'}
+
+
+def test_interactive():
+    renderer = InteractiveRenderer(constants.LAYOUT, constants.FS.fingerings)
+    before = ET.tostring(renderer.svg)
+    page = renderer()
+    assert page.count('<option ') == len(constants.FS.fingerings)
+    assert ET.tostring(renderer.svg) == before
+    assert renderer() == page
+
+    svg = ET.fromstring(page.partition('</select>\n')[2].partition('\n</body>')[0])
+    groups = {g.get('class'): g for g in svg.iterfind('.//svg:g', NS)}
+    parts = sum(len(p.parts) for p in constants.LAYOUT.pieces)
+    assert len(groups) == parts
+
+    # Each note's code shows the same <use>s as the SVG chart renders
+    for note, fingering in constants.FS.fingerings.items():
+        shown = dict.fromkeys(range(len(constants.LAYOUT.pieces)), 0)
+        for token in renderer.codes[str(note)].split():
+            piece, variant = token.split('-')
+            shown[int(piece)] = int(variant)
+        for i, piece in enumerate(constants.LAYOUT.pieces):
+            uses = [u.attrib for u in groups[f'p{i}-{shown[i]}']]
+            assert uses == [u.attrib for u in piece.render(fingering)], (note, i)
+
+
+def test_interactive_style():
+    style = InteractiveRenderer(constants.LAYOUT, constants.FS.fingerings).style
+    assert '[data-f~="0-1"] .p0-0 { display: none; }' in style
+    assert '[data-f~="0-1"] .p0-1 { display: inline; }' in style
+    assert '.outline { fill: white; stroke: black; stroke-width: 1.5; }' in style
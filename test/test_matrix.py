@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import dataclasses
+
+import constants
+import numpy as np
+
+FS = constants.FS
+
+
+def test_matrix():
+    m = FS.matrix
+    assert m is FS.matrix
+    rows = sum(len(v) for v in FS.alternates.values())
+    assert m.matrix.shape == (rows, len(FS.all))
+    assert m.matrix.dtype == bool
+    assert not m.matrix.flags.writeable
+
+    assert list(m.buttons) == [b.name for b in FS.all]
+    assert list(m.short_names) == [b.short_name for b in FS.all]
+    assert list(m.presses) == [b.press for b in FS.all]
+
+    for row, note_number in zip(m.matrix, m.note_numbers):
+        note = next(n for n in FS.alternates if n.note_number == note_number)
+        assert list(m.short_names[row]) == [b.short_name for b in FS.fingerings[note]]
+
+    assert np.shares_memory(m.uint8, m.matrix)
+    assert set(np.unique(m.uint8)) <= {0, 1}
+    assert m.packed.shape == (rows, (len(FS.all) + 7) // 8)
+
+
+def test_matrix_round_trip():
+    m = FS.matrix
+    fs = m.to_system(FS.lowest_c_, FS.metadata)
+    assert fs.alternates == FS.alternates
+    assert fs.all == FS.all
+
+    fields = dataclasses.fields(m)
+    kwargs = {f.name: getattr(m, f.name) for f in fields if f.name != 'matrix'}
+    unpacked = type(m).from_packed(m.packed, **kwargs)
+    assert np.array_equal(unpacked.matrix, m.matrix)
+
+
+def test_matrix_parquet(tmp_path):
+    m = FS.matrix
+    table = m.to_arrow()
+    assert table.num_rows == len(m.matrix)
+    assert table.column_names[2:] == list(m.buttons)
+
+    path = tmp_path / 'fingerings.parquet'
+    m.write_parquet(path)
+    m2 = type(m).read_parquet(path)
+    for name in ('matrix', 'note_numbers', 'alternates', 'buttons', 'presses'):
+        assert np.array_equal(getattr(m2, name), getattr(m, name)), name
+    assert m2.to_system().alternates == FS.alternates
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from xml.etree import ElementTree as ET
+
+import constants
+import pytest
+
+from fing.pages import page_layout, pages
+from fing.sizes import Size
+
+FINGERINGS = constants.FS.fingerings
+
+
+def _labels(page):
+    svg = ET.fromstring(page.partition('\n')[2])
+    return [
+        (t.text or '').strip() for t in svg.iter() if t.get('class') == 'note_label'
+    ]
+
+
+def test_one_page_is_the_chart():
+    (page,) = pages(constants.LAYOUT, FINGERINGS, notes_per_page=len(FINGERINGS))
+    assert page + '\n' == constants.TEST_FINGERINGS.read_text()
+
+
+def test_notes_per_page():
+    chart = list(pages(constants.LAYOUT, FINGERINGS, notes_per_page=10))
+    assert [len(_labels(p)) for p in chart] == [10, 10, 7]
+    labels = [label for p in chart for label in _labels(p)]
+    assert labels == [str(n) for n in FINGERINGS]
+
+
+def test_page_size():
+    size = Size(1200, 4500)
+    layout, per_page = page_layout(constants.LAYOUT, size)
+    assert (layout.rows, per_page) == (2, 10)
+
+    for page in pages(constants.LAYOUT, FINGERINGS, page_size=size):
+        svg = ET.fromstring(page.partition('\n')[2])
+        width, height = (int(i) for i in svg.get('viewBox', '').split()[2:])
+        assert width <= size.width and height <= size.height
+
+    with pytest.raises(ValueError):
+        next(pages(constants.LAYOUT, FINGERINGS, page_size=Size(100, 100)))
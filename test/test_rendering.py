@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from xml.etree import ElementTree as ET
+
 import constants
 import pytest
 
@@ -16,7 +18,22 @@ def test_rendering(capsys, use_colors):
         output_file = constants.TEST_FINGERINGS
 
     render_chart(files)
+    _compare(capsys.readouterr().out, output_file)
+
+
+def test_rendering_compact(capsys):
+    render_chart([constants.FS_FILE, constants.LAYOUT_FILE], compact=True)
     actual = capsys.readouterr().out
+    _compare(actual, constants.TEST_FINGERINGS_COMPACT)
+
+    assert len(actual) < len(constants.TEST_FINGERINGS.read_text()) * 2 / 3
+    svg = ET.fromstring(actual.partition('\n')[2])
+    symbols = svg.findall('.//{*}symbol')
+    assert 1 < len(symbols) <= len(constants.FS.fingerings)
+    assert not svg.findall('.//{*}rect[@width="100%"]')
+
+
+def _compare(actual, output_file):
     if constants.REWRITE_TEST_DATA or not output_file.exists():
         output_file.write_text(actual)
     else:
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import copy
+
+import constants
+import pytest
+
+from fing import fingering_system
+from fing.error_maker import ErrorMakerException
+from fing.note import Note
+
+FS = constants.FS
+
+
+def _lazy(doc=None):
+    doc = copy.deepcopy(constants.load(constants.FS_FILE) if doc is None else doc)
+    return fingering_system.make(doc, lazy=True)
+
+
+def test_lazy_reads_only_what_is_asked_for():
+    fs = _lazy()
+    assert list(fs.note_keys) == list(FS.alternates)
+    assert fs.fingerings_for('D1') == FS.alternates[Note('D1')]
+    assert list(fs._parsed) == [Note('D1')]
+    assert '_all_fingerings' not in fs.__dict__
+
+
+def test_fingerings_for():
+    fs = _lazy()
+    for note, fingerings in FS.alternates.items():
+        assert fs.fingerings_for(note) == fingerings
+    assert fs.fingerings_for('C0') == []
+
+
+def test_select_range():
+    selected = _lazy().select('C2', 'E2')
+    assert list(selected) == [n for n in FS.alternates if Note('C2') <= n <= Note('E2')]
+    assert all(v == FS.alternates[k] for k, v in selected.items())
+
+
+def test_select_instrument():
+    # An alto sounds a fourth above the chart
+    selected = FS.select('F4', 'A4', instrument='alto')
+    assert list(selected) == [n for n in FS.alternates if Note('C1') <= n <= Note('E1')]
+
+
+def test_select_instrument_below_c():
+    # The chart's C1 is still the alto's F4, even with a lower note
+    doc = constants.load(constants.FS_FILE)
+    doc['fingerings']['B_0'] = doc['fingerings']['C_1']
+    fs = _lazy(doc)
+    assert fs.transposition('alto') == 41
+    assert list(fs.select('F4', 'F4', instrument='alto')) == [Note('C1')]
+
+
+def test_select_using():
+    fs = _lazy()
+    selected = fs.select(high='C5', instrument='alto', using=['r3h'])
+    assert list(selected) == [Note('E♭1')]
+    r3h = fs.to_button['r3h']
+    assert all(r3h in f for f in selected[Note('E♭1')])
+
+
+def test_select_errors():
+    with pytest.raises(ErrorMakerException, match='Unknown button'):
+        _lazy().select(using=['nope'])
+    with pytest.raises(ErrorMakerException, match='Unknown instrument'):
+        _lazy().select(instrument='kazoo')
+
+
+def test_bad_fingering_is_only_found_when_read():
+    doc = constants.load(constants.FS_FILE)
+    doc['fingerings']['G3'] = 'lt nope'
+
+    fs = _lazy(doc)
+    assert fs.fingerings_for('C1') == FS.alternates[Note('C1')]
+    with pytest.raises(ErrorMakerException, match='Unknown button'):
+        fs.fingerings_for('G3')
+    with pytest.raises(ErrorMakerException, match='Unknown button'):
+        _lazy(doc).check()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+from xml.etree import ElementTree as ET
+
+import constants
+
+from fing.sprites import MANIFEST, SPRITE, SpriteSheet
+
+NS = {'svg': 'http://www.w3.org/2000/svg'}
+
+
+def test_sprites(tmp_path):
+    sheet = SpriteSheet(constants.LAYOUT, constants.FS.alternates)
+    written = sheet.write(tmp_path, jobs=4)
+    assert sorted(written) == sorted(sheet.contents)
+
+    manifest = json.loads((tmp_path / MANIFEST).read_text())
+    assert manifest['sprite'] == SPRITE
+    notes = manifest['notes']
+    assert list(notes) == [str(n) for n in constants.FS.alternates]
+
+    # The knee isn't drawn, so these two notes look the same
+    assert notes['C♯/D♭3'] == notes['D3']
+    assert len(sheet.contents) == len(notes) - 1
+
+    sprite = ET.fromstring((tmp_path / SPRITE).read_text())
+    defs = sprite.find('svg:defs', NS)
+    assert defs is not None
+    ids = {e.get('id') for e in defs}
+    for name in {f for v in notes.values() for f in v}:
+        fragment = (tmp_path / name).read_text()
+        assert len(fragment) < 1000
+        uses = ET.fromstring(fragment).iterfind('.//svg:use', NS)
+        assert {u.get('href', '')[1:] for u in uses} <= ids
+
+    assert sheet.write(tmp_path) == []
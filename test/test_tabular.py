@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import io
+import json
+
+import constants
+import pytest
+import tomlkit
+
+from fing import fingering_system
+from fing.exit import Exit
+from fing.note import Note
+from fing.tabular import (
+    Importer,
+    export_fingerings,
+    import_fingerings,
+    read_csv,
+    read_jsonl,
+    split_system,
+    write_csv,
+    write_jsonl,
+)
+
+FS = constants.FS
+
+
+def _import(rows, errors):
+    lines = Importer(FS, errors.append)(rows, 'rows')
+    return fingering_system.make(tomlkit.parse('\n'.join(lines)) | _rest())
+
+
+def _rest():
+    doc = tomlkit.parse(constants.FS_FILE.read_text())
+    return {k: v for k, v in doc.items() if k != 'fingerings'}
+
+
+def test_round_trip_csv():
+    fp = io.StringIO()
+    write_csv(FS, fp)
+    errors = []
+    rows = read_csv(fp.getvalue().splitlines())
+    lines = Importer(FS, errors.append)(rows, header=False)
+
+    # The same aligned table, and everything around it, as the original file
+    original = constants.FS_FILE.read_text()
+    head, tail = split_system(original)
+    assert head + ''.join(line + '\n' for line in lines) + tail == original
+    assert not errors
+
+
+def test_round_trip_jsonl():
+    fp = io.StringIO()
+    write_jsonl(FS, fp)
+    rows = fp.getvalue().splitlines()
+    assert json.loads(rows[0]) == {
+        'note': 'C_1',
+        'fingering': 'lt l1 l2 l3 r1 r2 r3 r4',
+    }
+
+    errors = []
+    fs = _import(read_jsonl(rows), errors)
+    assert not errors
+    assert fs.alternates == FS.alternates
+
+
+def test_import_errors():
+    text = """\
+note,fingering
+C1,lt l1 zz
+C1,l1 lt
+C1,lt
+D1,r3 r3h
+X1,lt
+E1,lt l1
+E1,l1 lt
+C1,l2
+D1
+"""
+    errors = []
+    fs = _import(read_csv(text.splitlines()), errors)
+    assert errors == [
+        "rows:2: Unknown button: C1: ['zz']",
+        "rows:5: Impossible fingering: D1: {'right-3': ['r3', 'r3h']}",
+        "rows:6: Invalid note: X1: 'X'",
+        'rows:8: Duplicate fingering',
+        'rows:9: C1 is not on consecutive rows',
+        'rows:10: Expected 2 cells, got 1',
+    ]
+    assert [[b.short_name for b in f] for f in fs.alternates[Note('C1')]] == [
+        ['lt', 'l1'],
+        ['lt'],
+    ]
+    assert list(fs.alternates) == [Note('C1'), Note('E1')]
+
+
+def test_import_button_columns():
+    text = 'note,lt,l1,l2\nC1,1,x,\nD1,,,yes\n'
+    errors = []
+    fs = _import(read_csv(text.splitlines()), errors)
+    assert not errors
+    assert [b.short_name for b in fs.fingerings[Note('C1')]] == ['lt', 'l1']
+    assert [b.short_name for b in fs.fingerings[Note('D1')]] == ['l2']
+
+
+def test_import_bad_json_lines():
+    text = """\
+{"note": "C1", "fingering": ["lt", "l1"]}
+{"note": "D1", "fingering": null}
+{"note": "E1", "fingering": 3}
+{"note": "F1", "fingering": ["lt", 1]}
+{"note": "G1"}
+{"note": "A1", "fingering": "lt"}
+"""
+    errors = []
+    fs = _import(read_jsonl(text.splitlines()), errors)
+    assert errors == [
+        'rows:2: Bad fingering: null',
+        'rows:3: Bad fingering: 3',
+        'rows:4: Bad fingering: ["lt", 1]',
+        "rows:5: Bad JSON line: 'fingering'",
+    ]
+    assert list(fs.alternates) == [Note('C1'), Note('A1')]
+
+
+@pytest.mark.parametrize(
+    'header, newline',
+    [
+        ('[fingerings]', '\n'),
+        ('[fingerings]  # The chart', '\n'),
+        ('["fingerings"]', '\n'),
+        ('[fingerings]', '\r\n'),
+    ],
+)
+def test_import_file(tmp_path, header, newline):
+    text = constants.FS_FILE.read_text().replace('[fingerings]\n', header + '\n')
+    text = text.replace('\n', newline)
+    system = tmp_path / 'system.toml'
+    system.write_bytes(text.encode())
+    rows = tmp_path / 'rows.csv'
+    export_fingerings(system, output=rows)
+
+    output = tmp_path / 'out.toml'
+    import_fingerings(system, rows, output=output)
+    assert output.read_bytes() == text.encode()
+
+
+def test_split_without_table():
+    with pytest.raises(Exit, match='No \\[fingerings\\] table'):
+        split_system("[metadata]\nname = 'fingerings'\n")
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import copy
+
+import constants
+
+from fing import fingering_system
+from fing.note import Note
+from fing.text_renderer import TextRenderer, show
+
+
+def test_text_renderer():
+    lines = list(TextRenderer(constants.FS)())
+    assert len(lines) == len(constants.FS.fingerings)
+    assert lines[:2] == ['C1      ●●●● ●●●● ○', 'C♯/D♭1  ●●●● ●●●◐ ○']
+    assert lines[-1] == 'D3      ◐●○● ●○●○ ○'
+
+
+def test_glyphs():
+    renderer = TextRenderer(constants.FS, glyphs={'oct': 'Ø'}, off='·')
+    (line,) = renderer([Note('E2')])
+    assert line == 'E2      Ø●●● ●●·· ·'
+
+
+def test_lazy():
+    doc = copy.deepcopy(constants.load(constants.FS_FILE))
+    fs = fingering_system.make(doc, lazy=True)
+    (line,) = TextRenderer(fs)([Note('C1')])
+    assert line == 'C1      ●●●● ●●●● ○'
+    assert fs.all == constants.FS.all
+    assert '_all_fingerings' not in fs.__dict__
+
+
+def test_show(capsys, monkeypatch):
+    monkeypatch.setenv('FING_SYSTEM', str(constants.FS_FILE))
+    show(['C1', 'C9'])
+    actual = capsys.readouterr()
+    assert actual.out == 'C1      ●●●● ●●●● ○\n'
+    assert actual.err == 'No fingering for: C9\n'
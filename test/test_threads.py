@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import constants
+
+from fing.render_chart import load_system
+from fing.renderer import Renderer
+from fing.xml_to_str import xml_to_str
+
+THREADS = 8
+ROUNDS = 4
+
+
+def test_render_concurrently():
+    fs, layout = load_system([constants.FS_FILE, constants.LAYOUT_FILE])
+    _, color = load_system(
+        [constants.FS_FILE, constants.LAYOUT_FILE, constants.COLOR_FILE]
+    )
+    assert layout and color
+    fs.freeze()
+
+    renderers = {
+        constants.TEST_FINGERINGS: Renderer(layout, fs.fingerings, jobs=4),
+        constants.TEST_FINGERINGS_COLOR: Renderer(color, fs.fingerings, jobs=4),
+        constants.TEST_FINGERINGS_COMPACT: Renderer(
+            layout, fs.fingerings, compact=True, jobs=4
+        ),
+    }
+    for r in renderers.values():
+        r.freeze()
+
+    def render(item):
+        path, renderer = item
+        return path, xml_to_str(renderer(), indent=not renderer.compact) + '\n'
+
+    work = list(renderers.items()) * ROUNDS
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(render, work))
+
+    assert len(results) == len(work)
+    for path, actual in results:
+        assert actual == path.read_text(), path
+
+
+def test_renderer_is_unchanged_by_calls():
+    renderer = Renderer(constants.LAYOUT, constants.FS.fingerings)
+    first = xml_to_str(renderer())
+    assert xml_to_str(renderer()) == first
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import io
+from xml.etree import ElementTree as ET
+
+import constants
+import numpy as np
+import pytest
+
+from fing.note import Note
+from fing.transitions import difficulty, draw_heatmap, labels, note_costs, write_csv
+
+FS = constants.FS
+
+
+def _brute(a, b, weights, same_finger):
+    cost = sum(weights.get(x.press, 1) for x in set(a) ^ set(b))
+    for press in {x.press for x in FS.all}:
+        lifted = any(x.press == press and x not in b for x in a)
+        pressed = any(x.press == press and x not in a for x in b)
+        cost += same_finger * (lifted and pressed)
+    return cost
+
+
+@pytest.mark.parametrize(
+    'weights, same_finger', [({}, 1.0), ({'left-thumb': 3, 'right-4': 0.5}, 2.5)]
+)
+def test_transition_costs(weights, same_finger):
+    m = FS.matrix
+    costs = m.transition_costs(weights, same_finger)
+    fingerings = [f for v in FS.alternates.values() for f in v]
+    assert costs.shape == (len(fingerings),) * 2
+
+    for i, a in enumerate(fingerings):
+        for j, b in enumerate(fingerings):
+            assert costs[i, j] == _brute(a, b, weights, same_finger), (i, j)
+
+
+def test_transitions_cached():
+    assert FS.matrix.transitions is FS.matrix.transitions
+    assert np.array_equal(FS.matrix.transitions, FS.matrix.transition_costs())
+
+
+def test_difficulty():
+    m = FS.matrix
+    d = difficulty(m, m.transitions, hardest=2)
+    assert d.step_max == 4
+    assert d.hardest[0][:2] == (Note('G1'), Note('G#1'))
+    assert 0 < d.step_mean < d.mean
+
+
+def test_exports():
+    m = FS.matrix
+    fp = io.StringIO()
+    write_csv(labels(m), m.transitions, fp)
+    rows = fp.getvalue().splitlines()
+    assert len(rows) == 1 + len(m.matrix)
+    assert rows[1].startswith('C1,0,3,1,4,')
+
+    notes, matrix = note_costs(m, m.transitions)
+    svg = draw_heatmap([str(n) for n in notes], matrix)
+    rects = svg.findall('rect')
+    assert len(rects) == len(notes) ** 2
+    style = svg.findtext('style', '')
+    assert style.startswith('.label{font-size:11px;font-family:monospace}.h0{')
+    assert ET.tostring(svg)
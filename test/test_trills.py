@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import constants
+import tomlkit
+
+from fing import fingering_system
+from fing.note import Note
+from fing.trills import TrillFinder, trill_chart
+
+
+def test_trills():
+    trills = list(TrillFinder(constants.FS)(interval=2))
+    pairs = {(str(t.low), str(t.high)): t for t in trills}
+    assert len(pairs) == len(trills)
+
+    t = pairs['C1', 'C♯/D♭1']
+    assert t.fingers == ('right-4',)
+    assert [b.short_name for b in t.lifted] == ['r4']
+    assert [b.short_name for b in t.pressed] == ['r4h']
+    assert str(t) == 'C1      C♯/D♭1  1  -r4 +r4h'
+
+    assert all(0 < t.high.note_number - t.low.note_number <= 2 for t in trills)
+    assert pairs['D1', 'E1'].cost == 1
+    assert pairs['E1', 'F1'].cost == 3
+
+
+def test_trill_alternates():
+    old = "E_1 = 'lt  l1  l2  l3  r1  r2              '"
+    new = "E_1 = ['lt  l1  l2  l3  r1  r2', 'lt  l1  l2  l3  r1  r3h']"
+    text = constants.FS_FILE.read_text()
+    assert old in text
+    fs = fingering_system.make(tomlkit.parse(text.replace(old, new)))
+    assert len(fs.alternates[Note('E1')]) == 2
+
+    pairs = {(t.low, t.high): t for t in TrillFinder(fs)(interval=2)}
+    t = pairs[Note('D#1'), Note('E1')]
+    assert t.high_fingering is fs.alternates[Note('E1')][1]
+    assert t.fingers == ('right-2',)
+
+
+def test_trill_chart():
+    trills = list(TrillFinder(constants.FS)(interval=1))
+    chart = trill_chart(trills)
+    assert len(chart) == 2 * len(trills)
+    assert [str(k) for k in chart][:2] == ['C1', 'C♯/D♭1']